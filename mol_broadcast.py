@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+import os
+import json
+import time
+import logging
+
+from mol_rpc import hex_to_int
+from mol_confirm import BlockConfirmer
+
+# --------------------------- BUNDLE BROADCAST ---------------------------
+# Streams a bundle written by `mol_mint.py sign` to the node. No ABI encoding,
+# no key: raw bytes go out at up to --rate tx/s with at most --window
+# transactions in flight. Receipts are found by following new blocks
+# (mol_confirm.BlockConfirmer) rather than polling each hash. Every state
+# change is appended to a JSONL journal so an interrupted run can be resumed
+# with the same bundle and journal.
+#
+# Token IDs in the bundle were predicted at signing time, so broadcasting
+# stops at the first revert or nonce gap: anything after it would link
+# children to the wrong parent.
+
+WINDOW        = 64
+POLL_INTERVAL = 1.0
+TX_TIMEOUT    = 600
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # nonce -> latest entry
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        self.entries[entry["nonce"]] = entry
+        self.f = open(path, "a")
+
+    def status(self, nonce):
+        entry = self.entries.get(nonce)
+        return entry["status"] if entry else None
+
+    def record(self, record, status, **extra):
+        entry = {
+            "nonce": record["nonce"],
+            "tx_hash": record["tx_hash"],
+            "idcode": record["idcode"],
+            "part": record["part"],
+            "token_id": record["token_id"],
+            "status": status,
+            "time": round(time.time(), 3),
+        }
+        entry.update(extra)
+        self.entries[entry["nonce"]] = entry
+        self.f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+class Broadcaster:
+    def __init__(self, web3, header, journal, rate=0.0, window=WINDOW,
+                 poll_interval=POLL_INTERVAL, timeout=TX_TIMEOUT, contract=None):
+        self.web3 = web3
+        self.header = header
+        self.journal = journal
+        self.rate = rate
+        self.window = window
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.contract = contract
+
+        self.confirmer = BlockConfirmer(web3, poll_interval)
+        self.inflight = {}    # tx_hash -> (record, sent_at)
+        self.unverified = []  # hashes whose nonce was already used before this run
+        self.stop_reason = None
+        self.counts = {"sent": 0, "confirmed": 0, "reverted": 0, "unconfirmed": 0, "skipped": 0}
+        self.last_confirmed_nonce = None
+        self._last_send = 0.0
+        self._ids_checked = contract is None
+
+    def preflight(self):
+        chain_id = self.web3.eth.chain_id
+        if chain_id != self.header["chain_id"]:
+            raise RuntimeError(f"Bundle is for chain {self.header['chain_id']}, node is on chain {chain_id}.")
+        self.confirmer.start()
+        return self.web3.eth.get_transaction_count(self.header["from"], "pending")
+
+    def check_token_ids(self, record):
+        """
+        The next parent/child tokenId on chain must match the prediction made
+        at signing time, otherwise the signed children point at the wrong parent.
+        """
+        if record["parent_id"] == 0:
+            on_chain = self.contract.functions.nextNFTId().call()
+        else:
+            on_chain = self.contract.functions.nextChildId().call()
+        if on_chain != record["token_id"]:
+            self.stop(f"tokenId mismatch at nonce {record['nonce']}: bundle expects {record['token_id']}, "
+                      f"contract will assign {on_chain}")
+            return False
+        self._ids_checked = True
+        return True
+
+    def stop(self, reason):
+        if self.stop_reason is None:
+            self.stop_reason = reason
+            logging.error(f"Stopping broadcast: {reason}")
+
+    def throttle(self):
+        if self.rate <= 0:
+            return
+        wait = self._last_send + 1.0 / self.rate - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_send = time.monotonic()
+
+    def send(self, record, raw):
+        self.throttle()
+        try:
+            self.web3.eth.send_raw_transaction(raw)
+        except Exception as e:
+            message = str(e).lower()
+            if "already known" not in message and "known transaction" not in message:
+                self.journal.record(record, "error", error=str(e))
+                self.stop(f"send failed at nonce {record['nonce']}: {e}")
+                return False
+        self.journal.record(record, "sent")
+        self.track(record)
+        self.counts["sent"] += 1
+        return True
+
+    def track(self, record):
+        self.inflight[record["tx_hash"]] = (record, time.monotonic())
+        self.confirmer.add(record["tx_hash"], record)
+
+    def poll(self):
+        """
+        Scan new blocks for in-flight transactions. Returns the number of
+        transactions that left the in-flight set.
+        """
+        found = []
+        if self.unverified:
+            found += self.confirmer.check_directly(self.unverified)
+            self.unverified = []
+        found += self.confirmer.poll()
+
+        now = time.monotonic()
+        stale = [h for h, (_, sent_at) in self.inflight.items() if now - sent_at > self.timeout]
+        if stale:
+            found += self.confirmer.check_directly(stale)
+
+        for tx_hash, record, receipt in found:
+            self.inflight.pop(tx_hash, None)
+            self.confirm(record, receipt)
+
+        # Given up on: journaled as unconfirmed so a resumed run checks them again.
+        unconfirmed = [h for h in stale if h in self.inflight]
+        for tx_hash in unconfirmed:
+            record = self.inflight.pop(tx_hash)[0]
+            self.confirmer.discard(tx_hash)
+            self.journal.record(record, "unconfirmed")
+            self.counts["unconfirmed"] += 1
+            self.stop(f"no receipt for nonce {record['nonce']} ({tx_hash}) after {self.timeout}s")
+        return len(found) + len(unconfirmed)
+
+    def confirm(self, record, receipt):
+        status = hex_to_int(receipt.get("status"))
+        block = hex_to_int(receipt.get("blockNumber"))
+        gas_used = hex_to_int(receipt.get("gasUsed"))
+        if status == 1:
+            self.journal.record(record, "confirmed", block=block, gas_used=gas_used)
+            self.counts["confirmed"] += 1
+            if self.last_confirmed_nonce is None or record["nonce"] > self.last_confirmed_nonce:
+                self.last_confirmed_nonce = record["nonce"]
+        else:
+            self.journal.record(record, "reverted", block=block, gas_used=gas_used)
+            self.counts["reverted"] += 1
+            self.stop(f"nonce {record['nonce']} ({record['idcode']} part {record['part']}) reverted in block {block}")
+
+    def wait_for_window(self, limit):
+        while self.inflight and len(self.inflight) >= limit and self.stop_reason is None:
+            if self.poll() == 0:
+                time.sleep(self.poll_interval)
+
+    def run(self, records):
+        chain_nonce = self.preflight()
+        expected = None
+        for record, raw in records:
+            if self.stop_reason is not None:
+                break
+            nonce = record["nonce"]
+            status = self.journal.status(nonce)
+            if status == "confirmed":
+                self.counts["skipped"] += 1
+                continue
+            if status == "reverted":
+                self.stop(f"journal shows nonce {nonce} reverted in an earlier run")
+                break
+
+            if nonce < chain_nonce:
+                # Already used on chain: only ours if its receipt shows up.
+                self.track(record)
+                self.unverified.append(record["tx_hash"])
+                expected = nonce + 1
+                continue
+            if expected is None:
+                expected = chain_nonce
+            if nonce != expected:
+                self.stop(f"nonce gap: next bundle nonce is {nonce}, account is at {expected}")
+                break
+            if not self._ids_checked:
+                self.wait_for_window(1)
+                if self.stop_reason is not None or not self.check_token_ids(record):
+                    break
+
+            self.wait_for_window(self.window)
+            if self.stop_reason is not None:
+                break
+            if not self.send(record, raw):
+                break
+            expected = nonce + 1
+
+        # Drain whatever is still in flight, even after a stop; poll() drops
+        # transactions without a receipt after the timeout.
+        while self.inflight:
+            if self.poll() == 0:
+                time.sleep(self.poll_interval)
+        return self.report()
+
+    def report(self):
+        report = dict(self.counts)
+        report["in_flight"] = len(self.inflight)
+        report["last_confirmed_nonce"] = self.last_confirmed_nonce
+        report["rpc_calls"] = self.confirmer.rpc_calls
+        report["stop_reason"] = self.stop_reason
+        return report
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import json
+import struct
+
+# --------------------------- SIGNED TRANSACTION BUNDLE ---------------------------
+# A bundle holds raw signed transactions produced offline by `mol_mint.py sign`
+# so the online host only has to push bytes. Layout:
+#
+#   MAGIC (8 bytes)
+#   u32 length + header JSON   chain_id, contract, from, first_nonce, gas_price,
+#                              first_token_id, first_child_id, ...
+#   repeated until EOF:
+#   u32 length + record JSON   nonce, idcode, part, token_id, parent_id, tx_hash
+#   u32 length + raw signed transaction bytes
+#
+# Lengths are big-endian. Records are written in nonce order and can be
+# streamed without loading the whole bundle.
+
+BUNDLE_MAGIC = b"MOLNFTB1"
+_LENGTH = struct.Struct(">I")
+
+class BundleError(Exception):
+    pass
+
+class BundleWriter:
+    def __init__(self, path, header):
+        self.path = path
+        self.count = 0
+        self.last_nonce = None
+        self.f = open(path, "wb")
+        self.f.write(BUNDLE_MAGIC)
+        self._write_block(json.dumps(header, sort_keys=True).encode())
+
+    def _write_block(self, data):
+        self.f.write(_LENGTH.pack(len(data)))
+        self.f.write(data)
+
+    def add(self, record, raw_transaction):
+        if self.last_nonce is not None and record["nonce"] != self.last_nonce + 1:
+            raise BundleError(f"Non-contiguous nonce {record['nonce']} after {self.last_nonce}")
+        self._write_block(json.dumps(record, separators=(",", ":")).encode())
+        self._write_block(raw_transaction)
+        self.last_nonce = record["nonce"]
+        self.count += 1
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _read_block(f, what):
+    prefix = f.read(_LENGTH.size)
+    if not prefix:
+        return None
+    if len(prefix) < _LENGTH.size:
+        raise BundleError(f"Truncated {what} length")
+    (length,) = _LENGTH.unpack(prefix)
+    data = f.read(length)
+    if len(data) < length:
+        raise BundleError(f"Truncated {what}")
+    return data
+
+def read_bundle_header(f):
+    if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+        raise BundleError("Not a MolNFT transaction bundle")
+    header = _read_block(f, "header")
+    if header is None:
+        raise BundleError("Missing bundle header")
+    return json.loads(header)
+
+def iter_bundle_records(f):
+    """
+    Yield (record, raw_transaction) pairs from an open bundle positioned after
+    the header.
+    """
+    while True:
+        meta = _read_block(f, "record")
+        if meta is None:
+            return
+        raw = _read_block(f, "raw transaction")
+        if raw is None:
+            raise BundleError("Record without raw transaction")
+        yield json.loads(meta), raw
+
+def read_bundle(path):
+    """
+    Returns (header, records) where 'records' is a generator that keeps the
+    file open until it is exhausted.
+    """
+    f = open(path, "rb")
+    try:
+        header = read_bundle_header(f)
+    except Exception:
+        f.close()
+        raise
+
+    def records():
+        with f:
+            yield from iter_bundle_records(f)
+
+    return header, records()
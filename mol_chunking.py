@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import os
+import math
+
+from mol_sign import estimate_mint_gas
+
+# --------------------------- CHUNK-SIZE OPTIMIZER ---------------------------
+# Picks the chunk size for a structure's fileBase64 from the block gas limit
+# and the mintNFT gas model in mol_sign:
+#
+#   - every child tx pays the fixed base + ERC721 bookkeeping, so fewer,
+#     larger chunks are cheaper ...
+#   - ... until the padded gas limit no longer fits in a block (times --fill)
+#     or the raw transaction exceeds the node's size limit.
+#
+# Candidates are equal splits into n chunks, from the smallest n that fits
+# upwards, plus "no children at all" when the whole file fits in the parent
+# mint. Chunk sizes are multiples of 4 base64 characters so every chunk
+# decodes on its own.
+#
+# 'layout' is how the contract stores fileBase64 (mol_sign.LAYOUTS): in
+# storage slots, or as data contracts (sstore2), where bytes cost about a
+# third as much and larger chunks fit a block.
+
+BLOCK_FILL     = 0.9        # share of the block gas limit one tx may use
+MAX_TX_BYTES   = 1_048_576  # CometBFT default max_tx_bytes (GenesisL1 is Cosmos SDK based)
+TX_ENVELOPE    = 160        # RLP fields + signature around the calldata
+EXTRA_SPLITS   = 8          # chunk counts above the minimum to evaluate
+
+def round_up4(n):
+    return (n + 3) // 4 * 4
+
+def tx_bytes(string_lengths):
+    calldata = 4 + 32 * (13 + len(string_lengths)) + sum(round_up4(n + 28) for n in string_lengths)
+    return calldata + TX_ENVELOPE
+
+def fits(string_lengths, block_gas_limit, fill=BLOCK_FILL, max_tx_bytes=MAX_TX_BYTES, layout="slots"):
+    return (estimate_mint_gas(string_lengths, layout=layout) <= block_gas_limit * fill
+            and tx_bytes(string_lengths) <= max_tx_bytes)
+
+def max_chunk_size(block_gas_limit, fill=BLOCK_FILL, max_tx_bytes=MAX_TX_BYTES, layout="slots"):
+    """
+    Largest multiple of 4 that a child mint can carry.
+    """
+    lo, hi = 0, max_tx_bytes // 4
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if fits([mid * 4], block_gas_limit, fill, max_tx_bytes, layout):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo * 4
+
+def plan_cost(total_length, parent_lengths, chunk_size, block_gas_limit, fill=BLOCK_FILL, block_time=None,
+              layout="slots"):
+    """
+    Expected gas, transaction count and block count for minting a structure
+    of 'total_length' base64 characters in chunks of 'chunk_size'
+    (0 = whole file carried by the parent). 'parent_lengths' are the parent's
+    metadata/image string lengths.
+    """
+    if chunk_size == 0:
+        sizes = []
+        gas = estimate_mint_gas(parent_lengths + [total_length], margin=1.0, layout=layout)
+    else:
+        full, rest = divmod(total_length, chunk_size)
+        sizes = [chunk_size] * full + ([rest] if rest else [])
+        gas = estimate_mint_gas(parent_lengths + [0], margin=1.0, layout=layout)
+        gas += sum(estimate_mint_gas([n], margin=1.0, layout=layout) for n in sizes)
+
+    # Children are packed into blocks by their padded gas limit; the parent
+    # has to be mined first, so it always takes a block of its own.
+    budget = block_gas_limit * fill
+    blocks = 1
+    if sizes:
+        per_block = max(1, int(budget // estimate_mint_gas([chunk_size], layout=layout)))
+        blocks += math.ceil(len(sizes) / per_block)
+    plan = {"chunk_size": chunk_size, "parts": len(sizes), "txs": 1 + len(sizes), "gas": gas, "blocks": blocks}
+    if block_time:
+        plan["seconds"] = blocks * block_time
+    return plan
+
+def optimize(total_length, parent_lengths, block_gas_limit, fill=BLOCK_FILL,
+             max_tx_bytes=MAX_TX_BYTES, block_time=None, layout="slots"):
+    """
+    Cheapest feasible plan by gas, then by blocks. Returns None if not even
+    a 4-character chunk fits (block gas limit below the per-tx overhead).
+    """
+    candidates = []
+    if fits(parent_lengths + [total_length], block_gas_limit, fill, max_tx_bytes, layout):
+        candidates.append(plan_cost(total_length, parent_lengths, 0, block_gas_limit, fill, block_time, layout))
+
+    largest = max_chunk_size(block_gas_limit, fill, max_tx_bytes, layout)
+    if largest > 0 and fits(parent_lengths + [0], block_gas_limit, fill, max_tx_bytes, layout):
+        n_min = math.ceil(total_length / largest)
+        for n in range(n_min, n_min + EXTRA_SPLITS + 1):
+            size = min(largest, round_up4(math.ceil(total_length / n)))
+            candidates.append(plan_cost(total_length, parent_lengths, size, block_gas_limit, fill, block_time, layout))
+
+    if not candidates:
+        return None
+    return min(candidates, key=lambda p: (p["gas"], p["blocks"], p["txs"]))
+
+def current_plan(part_lengths, parent_lengths, block_gas_limit, fill=BLOCK_FILL, block_time=None, layout="slots"):
+    """
+    Cost of the split that exists on disk today. For an unsplit structure
+    pass its file length in 'parent_lengths' and no parts.
+    """
+    gas = estimate_mint_gas(parent_lengths + ([0] if part_lengths else []), margin=1.0, layout=layout)
+    gas += sum(estimate_mint_gas([n], margin=1.0, layout=layout) for n in part_lengths)
+    budget = block_gas_limit * fill
+    blocks = 1
+    fits_all = all(estimate_mint_gas([n], layout=layout) <= budget for n in part_lengths)
+    if part_lengths:
+        largest_limit = estimate_mint_gas([max(part_lengths)], layout=layout)
+        blocks += math.ceil(len(part_lengths) / max(1, int(budget // largest_limit)))
+    plan = {"chunk_size": max(part_lengths, default=0), "parts": len(part_lengths), "txs": 1 + len(part_lengths),
+            "gas": gas, "blocks": blocks, "fits": fits_all}
+    if block_time:
+        plan["seconds"] = blocks * block_time
+    return plan
+
+def write_chunks(data, chunk_size, out_dir, idcode):
+    """
+    Write 'data' as <idcode>.bcif.gz.base64 (chunk_size 0) or as
+    <idcode>.bcif.gz.base64_partN files. Returns the written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{idcode.lower()}.bcif.gz.base64")
+    if chunk_size == 0:
+        with open(base, "w") as f:
+            f.write(data)
+        return [base]
+    paths = []
+    for n, start in enumerate(range(0, len(data), chunk_size), start=1):
+        path = f"{base}_part{n}"
+        with open(path, "w") as f:
+            f.write(data[start:start + chunk_size])
+        paths.append(path)
+    return paths
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import gzip
+import base64
+import lzma
+import zlib
+
+# --------------------------- PAYLOAD CODECS ---------------------------
+# fileBase64 is base64 of a compressed BinaryCIF file; readers tell the codec
+# from the first bytes of the decoded data:
+#
+#   gzip      1f 8b                 the original .bcif.gz (Mol* reads it as is)
+#   xz        fd 37 7a 58 5a 00     lzma, preset 9 | extreme
+#   zstd      28 b5 2f fd           level 22, long window
+#   brotli    4d 4e 42 52 ("MNBR")  quality 11, 16 MiB window; a brotli stream
+#                                   has no magic of its own, so this prefix is
+#                                   written in front of it
+#
+# Anything else is taken as uncompressed BCIF. recompress() tries every
+# codec available here and keeps the smallest payload, which on chain means
+# the fewest base64 characters (calldata and storage).
+#
+# xz is in the standard library; zstd needs zstandard (pip install
+# zstandard) and brotli needs brotli (pip install brotli). A codec whose
+# module is missing is skipped when compressing and raises when decoding.
+
+GZIP_MAGIC   = b"\x1f\x8b"
+XZ_MAGIC     = b"\xfd7zXZ\x00"
+ZSTD_MAGIC   = b"\x28\xb5\x2f\xfd"
+BROTLI_MAGIC = b"MNBR"
+MAGIC_BYTES  = 6  # enough leading bytes to detect any codec
+
+CODECS = ("gzip", "xz", "zstd", "brotli")
+
+def detect(data):
+    """
+    Codec of a decoded payload from its leading bytes, or None for raw BCIF.
+    """
+    for codec, magic in (("gzip", GZIP_MAGIC), ("xz", XZ_MAGIC), ("zstd", ZSTD_MAGIC), ("brotli", BROTLI_MAGIC)):
+        if data[:len(magic)] == magic:
+            return codec
+    return None
+
+def b64_length(n):
+    return (n + 2) // 3 * 4
+
+def compress(raw, codec):
+    if codec == "gzip":
+        return gzip.compress(raw, 9, mtime=0)
+    if codec == "xz":
+        return lzma.compress(raw, preset=9 | lzma.PRESET_EXTREME)
+    if codec == "zstd":
+        import zstandard
+
+        params = zstandard.ZstdCompressionParameters.from_level(22, source_size=len(raw), enable_ldm=True)
+        return zstandard.ZstdCompressor(compression_params=params).compress(raw)
+    if codec == "brotli":
+        import brotli
+
+        return BROTLI_MAGIC + brotli.compress(raw, quality=11, lgwin=24)
+    raise ValueError(f"unknown codec {codec}")
+
+def decompress(data):
+    """
+    Decoded payload -> raw BCIF bytes.
+    """
+    decoder = Decoder(unwrap_gzip=True)
+    return decoder.feed(data) + decoder.finish()
+
+def available():
+    """
+    Codecs whose compressor can be loaded here.
+    """
+    found = ["gzip", "xz"]
+    for codec, module in (("zstd", "zstandard"), ("brotli", "brotli")):
+        try:
+            __import__(module)
+            found.append(codec)
+        except ImportError:
+            pass
+    return found
+
+def parse_codecs(text):
+    """
+    "xz,brotli" -> ("xz", "brotli"); "auto" -> "auto" (every available codec).
+    """
+    if text == "auto":
+        return text
+    codecs = tuple(c.strip().lower() for c in text.split(",") if c.strip())
+    unknown = [c for c in codecs if c not in CODECS]
+    if unknown or not codecs:
+        raise ValueError(f"codecs must be among {', '.join(CODECS)}")
+    return codecs
+
+def recompress(payload, codecs=None):
+    """
+    Try each codec on the BCIF inside 'payload' (bytes in any supported
+    codec) and return (codec, bytes) with the fewest base64 characters; the
+    original payload wins ties.
+    """
+    raw = decompress(payload)
+    best = (detect(payload), payload)
+    for codec in codecs or available():
+        data = compress(raw, codec)
+        if b64_length(len(data)) < b64_length(len(best[1])):
+            best = (codec, data)
+    return best
+
+def recompress_base64(job):
+    """
+    Worker entry point: (fileBase64 text, codecs) -> (codec, new text, error).
+    On error the text comes back unchanged.
+    """
+    text, codecs = job
+    try:
+        payload = base64.b64decode(text)
+        codec, data = recompress(payload, codecs)
+        return codec, text if data is payload else base64.b64encode(data).decode(), None
+    except Exception as e:
+        return None, text, f"{type(e).__name__}: {e}"
+
+class Decoder:
+    """
+    Incremental decompression of a payload fed in pieces. gzip and raw
+    payloads pass through unchanged (Mol* reads .bcif.gz itself); xz, zstd
+    and brotli come out as raw BCIF. The codec is picked from the first
+    MAGIC_BYTES bytes.
+    """
+    def __init__(self, unwrap_gzip=False):
+        self.unwrap_gzip = unwrap_gzip
+        self.head = b""
+        self.codec = None
+        self.stream = None
+
+    def _start(self):
+        self.codec = detect(self.head)
+        data = self.head
+        if self.codec == "xz":
+            self.stream = lzma.LZMADecompressor(format=lzma.FORMAT_XZ).decompress
+        elif self.codec == "zstd":
+            import zstandard
+
+            self.stream = zstandard.ZstdDecompressor().decompressobj().decompress
+        elif self.codec == "brotli":
+            import brotli
+
+            self.stream = brotli.Decompressor().process
+            data = data[len(BROTLI_MAGIC):]
+        elif self.codec == "gzip" and self.unwrap_gzip:
+            self.stream = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+        else:
+            self.stream = bytes
+        return self.stream(data)
+
+    def pass_through(self):
+        """
+        Skip detection: everything fed is returned unchanged (used when
+        resuming a passthrough payload mid-stream).
+        """
+        self.stream = bytes
+
+    def feed(self, data):
+        if self.stream is not None:
+            return self.stream(data)
+        self.head += data
+        if len(self.head) < MAGIC_BYTES:
+            return b""
+        return self._start()
+
+    def finish(self):
+        return self._start() if self.stream is None else b""
+
+    @property
+    def transcodes(self):
+        """
+        True once the output differs from the input bytes.
+        """
+        return self.stream is not None and self.stream is not bytes
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import time
+import logging
+
+from mol_rpc import rpc_batch, rpc_call, hex_to_int
+
+# --------------------------- BLOCK-DRIVEN CONFIRMATION ---------------------------
+# Instead of polling eth_getTransactionReceipt for every outstanding hash, the
+# confirmer follows the chain head, fetches each new block's transaction
+# hashes once (eth_getBlockByNumber, hashes only) and asks for receipts only
+# for hashes it is waiting on. RPC calls scale with the number of blocks plus
+# the number of our own transactions, not with transactions x polls.
+
+POLL_INTERVAL       = 1.0
+MAX_BLOCKS_PER_POLL = 50
+
+def normalize_hash(tx_hash):
+    if isinstance(tx_hash, (bytes, bytearray)):
+        return "0x" + bytes(tx_hash).hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+class BlockConfirmer:
+    def __init__(self, web3, poll_interval=POLL_INTERVAL, start_block=None, raw=True):
+        """
+        raw=True returns receipts as plain JSON-RPC dicts (fetched in
+        batches); raw=False returns web3-formatted receipts, as needed by
+        contract.events.<Event>().process_receipt().
+        """
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self.raw = raw
+        self.outstanding = {}  # tx_hash -> payload
+        self.resolved = {}     # tx_hash -> (payload, receipt), kept until collected
+        self.unindexed = []    # seen in a scanned block, receipt not served yet
+        self.next_block = start_block
+        self.rpc_calls = 0
+
+    def head(self):
+        self.rpc_calls += 1
+        result, error = rpc_call(self.web3, "eth_blockNumber", [])
+        if error is not None:
+            raise RuntimeError(f"eth_blockNumber failed: {error}")
+        return hex_to_int(result)
+
+    def start(self):
+        """
+        Pin the first block to scan. Call before sending, so a transaction
+        mined in the very next block is not missed.
+        """
+        if self.next_block is None:
+            self.next_block = self.head()
+
+    def add(self, tx_hash, payload=None):
+        self.start()
+        self.outstanding[normalize_hash(tx_hash)] = payload
+
+    def discard(self, tx_hash):
+        self.outstanding.pop(normalize_hash(tx_hash), None)
+
+    def __len__(self):
+        return len(self.outstanding)
+
+    def fetch_receipts(self, hashes):
+        if self.raw:
+            self.rpc_calls += (len(hashes) + 99) // 100
+            return [receipt for receipt, _ in rpc_batch(self.web3, [("eth_getTransactionReceipt", [h]) for h in hashes])]
+        receipts = []
+        for h in hashes:
+            self.rpc_calls += 1
+            receipts.append(self.web3.eth.get_transaction_receipt(h))
+        return receipts
+
+    def poll(self):
+        """
+        Scan blocks from next_block up to the head (at most
+        MAX_BLOCKS_PER_POLL) and return [(tx_hash, payload, receipt)] for
+        outstanding transactions found in them. Hashes seen in a block whose
+        receipt the node does not serve yet are asked for again next time,
+        since their block is not scanned twice.
+        """
+        if not self.outstanding:
+            return []
+        self.start()
+        matched = [h for h in self.unindexed if h in self.outstanding]
+        self.unindexed = []
+        head = self.head()
+        if head >= self.next_block:
+            last = min(head, self.next_block + MAX_BLOCKS_PER_POLL - 1)
+            numbers = list(range(self.next_block, last + 1))
+            self.rpc_calls += (len(numbers) + 99) // 100
+            blocks = rpc_batch(self.web3, [("eth_getBlockByNumber", [hex(n), False]) for n in numbers])
+
+            for number, (block, error) in zip(numbers, blocks):
+                if error is not None or block is None:
+                    # Node has not caught up with its own head yet; retry from here.
+                    break
+                for tx_hash in block.get("transactions", []):
+                    tx_hash = normalize_hash(tx_hash)
+                    if tx_hash in self.outstanding:
+                        matched.append(tx_hash)
+                self.next_block = number + 1
+
+        found = []
+        if matched:
+            for tx_hash, receipt in zip(matched, self.fetch_receipts(matched)):
+                if receipt is None:
+                    self.unindexed.append(tx_hash)
+                    continue
+                found.append((tx_hash, self.outstanding.pop(tx_hash), receipt))
+        return found
+
+    def check_directly(self, hashes):
+        """
+        Receipt lookup for hashes that may have been mined before the scan
+        started (e.g. when resuming). Resolves and returns the ones found.
+        """
+        hashes = [normalize_hash(h) for h in hashes if normalize_hash(h) in self.outstanding]
+        found = []
+        if hashes:
+            for tx_hash, receipt in zip(hashes, self.fetch_receipts(hashes)):
+                if receipt is not None:
+                    found.append((tx_hash, self.outstanding.pop(tx_hash), receipt))
+        return found
+
+    def wait(self, tx_hash, timeout=120):
+        """
+        Block until 'tx_hash' is mined and return its receipt. Receipts of
+        other outstanding transactions found on the way are kept in
+        self.resolved.
+        """
+        tx_hash = normalize_hash(tx_hash)
+        if tx_hash not in self.outstanding and tx_hash not in self.resolved:
+            self.add(tx_hash)
+        deadline = time.monotonic() + timeout
+        while tx_hash not in self.resolved:
+            found = self.poll()
+            for h, payload, receipt in found:
+                self.resolved[h] = (payload, receipt)
+            if tx_hash in self.resolved:
+                break
+            if time.monotonic() > deadline:
+                found = self.check_directly([tx_hash])
+                if found:
+                    h, payload, receipt = found[0]
+                    self.resolved[h] = (payload, receipt)
+                    break
+                raise TimeoutError(f"Transaction {tx_hash} not mined after {timeout}s")
+            if not found:
+                time.sleep(self.poll_interval)
+        return self.resolved.pop(tx_hash)[1]
+
+    def log_stats(self):
+        logging.info(f"Confirmer used {self.rpc_calls} RPC calls; scanned up to block {self.next_block}.")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+import os
+import re
+import logging
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from mol_reader import CallError, META_FIELDS
+
+# --------------------------- METADATA SNAPSHOT EXPORT ---------------------------
+# Writes one row per parent token (getMetadata fields, owner, child count) as
+# columnar files for analytics. Parents are numbered 1..nextNFTId-1 without
+# gaps (the contract has no burn), so that range is the enumeration; children
+# (tokenIds from 100,000,000) are only counted. Each token costs three view
+# calls (getMetadata, ownerOf, getChildrenPaginated with limit 0, which
+# returns just the total) sent together through the reader's batcher, and
+# batches of tokens run concurrently.
+#
+# getMetadata always returns imageBase64 and fileBase64, so skipping them
+# saves no RPC traffic; unless asked for they are dropped as soon as each
+# batch is decoded, which keeps the buffered rows and the files small.
+#
+# Each run writes part-<first>-<last>.<ext> into the output directory and
+# starts after the highest tokenId already exported there.
+#
+# Needs pyarrow (pip install pyarrow), imported when an export runs.
+
+EXPORT_BATCH = 100  # tokens per batch (at most 3 * EXPORT_BATCH calls per request)
+WORKERS      = 8
+LIGHT_FIELDS = META_FIELDS[:9]
+HEAVY_FIELDS = META_FIELDS[9:]
+FORMATS      = {"parquet": ".parquet", "arrow": ".arrow"}
+
+_PART = re.compile(r"^part-(\d+)-(\d+)\.(parquet|arrow)$")
+
+def schema(heavy):
+    import pyarrow as pa
+
+    fields = [pa.field("token_id", pa.uint64())]
+    fields += [pa.field(name, pa.string()) for name in LIGHT_FIELDS]
+    fields += [pa.field("owner", pa.string()), pa.field("children", pa.uint32())]
+    if heavy:
+        fields += [pa.field(name, pa.large_string()) for name in HEAVY_FIELDS]
+    return pa.schema(fields)
+
+def existing_parts(out_dir):
+    """
+    [(first, last, path), ...] of the parts already in 'out_dir', by tokenId.
+    """
+    if not os.path.isdir(out_dir):
+        return []
+    parts = []
+    for name in os.listdir(out_dir):
+        m = _PART.match(name)
+        if m:
+            parts.append((int(m.group(1)), int(m.group(2)), os.path.join(out_dir, name)))
+    return sorted(parts)
+
+def read_schema(path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        return pq.read_schema(path)
+    with pa.OSFile(path, "rb") as f:
+        return pa.ipc.open_file(f).schema
+
+def fetch_rows(reader, token_ids, heavy=False, batch=EXPORT_BATCH):
+    """
+    Rows for 'token_ids' in order, stopping before the first token that
+    could not be read. Returns (rows, error or None).
+    """
+    calls = []
+    for t in token_ids:
+        calls += [("getMetadata", (t,)), ("ownerOf", (t,)), ("getChildrenPaginated", (t, 0, 0))]
+    values = reader.call_multi(calls, batch=3 * batch)
+    rows = []
+    for token_id, meta, owner, count in zip(token_ids, values[0::3], values[1::3], values[2::3]):
+        for value in (meta, owner, count):
+            if isinstance(value, CallError):
+                return rows, value
+        row = {"token_id": token_id, "owner": owner, "children": count[1]}
+        row.update(zip(LIGHT_FIELDS, meta))
+        if heavy:
+            row.update(zip(HEAVY_FIELDS, meta[9:]))
+        rows.append(row)
+    return rows, None
+
+def export(reader, out_dir, fmt="parquet", heavy=False, workers=WORKERS, batch=EXPORT_BATCH):
+    """
+    Export every parent token after the last one in 'out_dir'. Returns
+    (path or None, rows written, error or None).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table_schema = schema(heavy)
+    parts = existing_parts(out_dir)
+    if parts and read_schema(parts[-1][2]).names != table_schema.names:
+        raise ValueError(f"{parts[-1][2]} was exported {'without' if heavy else 'with'} --with-payloads; "
+                         f"use a new directory to change columns.")
+    first = parts[-1][1] + 1 if parts else 1
+    end = reader.call("nextNFTId")
+    if first >= end:
+        return None, 0, None
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = os.path.join(out_dir, f".part-{first}.tmp")
+    batches = iter([list(range(start, min(start + batch, end))) for start in range(first, end, batch)])
+    written = 0
+    last = first - 1
+    error = None
+    sink = pa.OSFile(tmp, "wb")
+    writer = pq.ParquetWriter(sink, table_schema) if fmt == "parquet" else pa.ipc.new_file(sink, table_schema)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # At most 2 * workers batches fetched ahead of the writer
+            window = deque(executor.submit(fetch_rows, reader, ids, heavy, batch)
+                           for ids in islice(batches, 2 * workers))
+            while window:
+                rows, error = window.popleft().result()
+                if rows:
+                    table = pa.Table.from_pylist(rows, schema=table_schema)
+                    if fmt == "parquet":
+                        writer.write_table(table)
+                    else:
+                        writer.write(table)
+                    written += len(rows)
+                    last = rows[-1]["token_id"]
+                    logging.info(f"Exported tokens up to {last} ({written} rows).")
+                if error is not None:
+                    # Rows after a failed token would leave a gap the next run cannot see.
+                    for future in window:
+                        future.cancel()
+                    break
+                ids = next(batches, None)
+                if ids is not None:
+                    window.append(executor.submit(fetch_rows, reader, ids, heavy, batch))
+    finally:
+        writer.close()
+        sink.close()
+
+    if written == 0:
+        os.remove(tmp)
+        return None, 0, error
+    path = os.path.join(out_dir, f"part-{first}-{last}{FORMATS[fmt]}")
+    os.replace(tmp, path)
+    return path, written, error
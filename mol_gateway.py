@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+import os
+import re
+import json
+import time
+import base64
+import bisect
+import hashlib
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mol_abi import CACHE_DIR
+from mol_codec import Decoder
+from mol_reader import CallError, CHUNK_BATCH, FILE_FIELD, META_FIELDS
+
+# --------------------------- CACHING HTTP GATEWAY ---------------------------
+# Serves what the viewer assembles in the browser, in one HTTP request:
+#
+#   GET /token/<id>.bcif            the token's molecular data: its own
+#                                   fileBase64 followed by every child's, in
+#                                   child order, base64-decoded (the bytes
+#                                   the viewer hands to Mol* as "bcif")
+#   GET /token/<id>/metadata.json   getMetadata fields, the image as a data
+#                                   URI and the child count
+#
+# A token is read from the chain once (getChildrenPaginated, then the
+# children's data in concurrent getCombinedDataRange calls, see mol_reader)
+# and kept in a bounded on-disk cache, evicted least recently used first. Entries are refetched
+# after --ttl seconds since updateMetadata leaves no event to watch; the ETag
+# is the SHA-256 of the content, so unchanged data still answers 304.
+#
+# While a token is being fetched its chunks are decoded in child order into
+# <tokenId>.partial and responses stream from there as bytes arrive, with
+# the next PREFETCH batches already in flight. The fetch runs on its own
+# thread, so a client that disconnects does not stop it, and its progress
+# (the decoded offset where each chunk starts) is saved next to the partial
+# file so a restarted gateway resumes at the next chunk. Range requests are
+# served from the cached file, or from the partial file once the chunks
+# holding the requested bytes have arrived.
+#
+# Payloads re-compressed with xz, zstd or brotli (mol_codec) are decompressed
+# on the way into the partial file, so clients always get bytes Mol* reads:
+# the original .bcif.gz, or raw BCIF. Offsets and ETags refer to those
+# bytes. A decompressor's state cannot be saved, so such a fetch restarts
+# from the first chunk instead of resuming.
+
+GATEWAY_CACHE_DIR = os.path.join(CACHE_DIR, "gateway")
+CACHE_LIMIT       = 2 * 1024 ** 3
+TTL               = 3600
+FETCH_WORKERS     = 8
+PREFETCH          = 8     # chunk reads requested ahead of the one being decoded
+STREAM_BLOCK      = 1 << 20
+
+KINDS = {"bcif": "application/octet-stream", "json": "application/json"}
+_ENTRY = re.compile(r"^(\d+)\.([0-9a-f]{16})\.(bcif|json)$")
+_ROUTE = re.compile(r"^/token/(\d+)(?:\.bcif|/metadata\.json)$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+class TokenNotFound(Exception):
+    pass
+
+class TokenCache:
+    """
+    Files named <tokenId>.<etag>.<kind> under 'directory', at most 'limit'
+    bytes in total. The index is rebuilt from the directory on start.
+    """
+    def __init__(self, directory, limit=CACHE_LIMIT):
+        self.directory = directory
+        self.limit = limit
+        self.entries = {}  # (token_id, kind) -> [path, etag, size, fetched_at, last_used]
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            m = _ENTRY.match(name)
+            if not m:
+                continue
+            path = os.path.join(directory, name)
+            st = os.stat(path)
+            key = (int(m.group(1)), m.group(3))
+            old = self.entries.get(key)
+            if old is not None:  # left over from an interrupted replace; keep the newer one
+                if old[3] >= st.st_mtime:
+                    self._remove(path)
+                    continue
+                self._remove(old[0])
+            self.entries[key] = [path, m.group(2), st.st_size, st.st_mtime, st.st_atime]
+        self.size = sum(e[2] for e in self.entries.values())
+
+    def get(self, token_id, kind, ttl=TTL):
+        """
+        (path, etag) of a fresh entry, or None.
+        """
+        with self.lock:
+            entry = self.entries.get((token_id, kind))
+            if entry is None or time.time() - entry[3] > ttl:
+                return None
+            entry[4] = time.time()
+            return entry[0], entry[1]
+
+    def partial_path(self, token_id):
+        return os.path.join(self.directory, f"{token_id}.partial")
+
+    def put(self, token_id, kind, data):
+        etag = hashlib.sha256(data).hexdigest()[:16]
+        tmp = os.path.join(self.directory, f"{token_id}.{kind}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        return self.adopt(token_id, kind, tmp, etag, len(data))
+
+    def adopt(self, token_id, kind, src, etag, size):
+        """
+        Move the finished file 'src' into the cache as the entry for 'token_id'.
+        """
+        path = os.path.join(self.directory, f"{token_id}.{etag}.{kind}")
+        os.replace(src, path)
+        now = time.time()
+        with self.lock:
+            old = self.entries.pop((token_id, kind), None)
+            if old is not None:
+                self.size -= old[2]
+                if old[0] != path:
+                    self._remove(old[0])
+            self.entries[(token_id, kind)] = [path, etag, size, now, now]
+            self.size += size
+            self._evict(keep=(token_id, kind))
+        return path, etag
+
+    def _evict(self, keep):
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1][4]):
+            if self.size <= self.limit:
+                return
+            if key == keep:
+                continue
+            del self.entries[key]
+            self.size -= entry[2]
+            self._remove(entry[0])
+
+    def _remove(self, path):
+        # An open response keeps reading an unlinked file on POSIX.
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class TokenFetch:
+    """
+    Decodes one token's chunks (its own fileBase64, then each child's) into
+    the partial file. offsets[i] is the decoded offset where chunk i starts,
+    so offsets[-1] bytes are available and chunk_at() maps a byte offset to
+    the chunk holding it.
+    """
+    def __init__(self, gateway, token_id, own_file, child_ids):
+        self.gateway = gateway
+        self.token_id = token_id
+        self.own_file = own_file
+        self.chunk_ids = [token_id] + list(child_ids)
+        self.path = gateway.cache.partial_path(token_id)
+        self.layout_path = f"{self.path}.json"
+        self.offsets = [0]
+        self.carry = ""  # base64 characters past the last complete quantum
+        self.decoder = Decoder()
+        self.digest = hashlib.sha256()
+        self.cond = threading.Condition()
+        self.done = False
+        self.error = None
+        self.entry = None
+        self.resumed = self._resume()
+
+    def _resume(self):
+        try:
+            with open(self.layout_path) as f:
+                layout = json.load(f)
+        except (OSError, ValueError):
+            layout = None
+        if (not layout or layout.get("chunk_ids") != self.chunk_ids or layout.get("transcoded", True)
+                or not os.path.exists(self.path)):
+            open(self.path, "wb").close()
+            return False
+        with open(self.path, "r+b") as f:
+            f.truncate(layout["offsets"][-1])
+            while True:
+                block = f.read(STREAM_BLOCK)
+                if not block:
+                    break
+                self.digest.update(block)
+        self.offsets = layout["offsets"]
+        self.carry = layout["carry"]
+        self.decoder.pass_through()
+        return True
+
+    def _save(self):
+        tmp = f"{self.layout_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"chunk_ids": self.chunk_ids, "offsets": self.offsets, "carry": self.carry,
+                       "transcoded": self.decoder.transcodes or self.decoder.stream is None}, f)
+        os.replace(tmp, self.layout_path)
+
+    @property
+    def available(self):
+        return self.offsets[-1]
+
+    def chunk_at(self, offset):
+        return bisect.bisect_right(self.offsets, offset) - 1
+
+    def run(self):
+        first = len(self.offsets) - 1
+        try:
+            with open(self.path, "ab") as out:
+                for index, chunk in enumerate(self.gateway.iter_chunks(self.own_file, self.chunk_ids, first),
+                                              start=first):
+                    text = self.carry + chunk
+                    cut = len(text) - len(text) % 4
+                    data = self.decoder.feed(base64.b64decode(text[:cut]))
+                    self._append(out, data, text[cut:])
+                    if index % CHUNK_BATCH == 0:
+                        self._save()
+                if self.carry:
+                    raise ValueError(f"{len(self.carry)} base64 characters left over after the last chunk")
+                # The last chunk ends where the trailing output lands.
+                tail = self.decoder.finish()
+                if tail:
+                    out.write(tail)
+                    out.flush()
+                    self.digest.update(tail)
+                    with self.cond:
+                        self.offsets[-1] += len(tail)
+                        self.cond.notify_all()
+            with self.cond:
+                self.entry = self.gateway.cache.adopt(self.token_id, "bcif", self.path,
+                                                      self.digest.hexdigest()[:16], self.available)
+                self.done = True
+                self.cond.notify_all()
+            try:
+                os.remove(self.layout_path)
+            except OSError:
+                pass
+        except Exception as e:
+            logging.error(f"Fetching token {self.token_id} stopped at chunk {len(self.offsets) - 1} "
+                          f"of {len(self.chunk_ids)}: {e}")
+            self._save()
+            with self.cond:
+                self.error = e
+                self.cond.notify_all()
+
+    def _append(self, out, data, carry):
+        out.write(data)
+        out.flush()
+        self.digest.update(data)
+        with self.cond:
+            self.carry = carry
+            self.offsets.append(self.offsets[-1] + len(data))
+            self.cond.notify_all()
+
+    def wait_for(self, end=None):
+        """
+        Block until bytes up to 'end' (None: all of them) are decoded or the
+        fetch has stopped. Returns (available, total or None).
+        """
+        with self.cond:
+            while not self.done and self.error is None and (end is None or self.available < end):
+                self.cond.wait()
+            if self.error is not None and (end is None or self.available < end):
+                raise self.error
+            return self.available, (self.available if self.done else None)
+
+    def stream(self, start, end=None):
+        """
+        Yield decoded bytes [start, end) as they arrive; end=None reads to
+        the end of the data.
+        """
+        with self.cond:
+            f = open(self.entry[0] if self.done else self.path, "rb")
+        with f:
+            f.seek(start)
+            pos = start
+            while end is None or pos < end:
+                with self.cond:
+                    while self.available <= pos and not self.done and self.error is None:
+                        self.cond.wait()
+                    limit = self.available if end is None else min(self.available, end)
+                    error = self.error
+                if limit <= pos:
+                    if error is not None:
+                        raise error
+                    return
+                while pos < limit:
+                    block = f.read(min(STREAM_BLOCK, limit - pos))
+                    pos += len(block)
+                    yield block
+
+class Gateway:
+    def __init__(self, reader, cache, ttl=TTL, workers=FETCH_WORKERS):
+        self.reader = reader
+        self.cache = cache
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.fetch_locks = {}
+        self.active = {}  # token_id -> TokenFetch in progress
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "fetches": 0, "resumed": 0, "streamed": 0, "not_modified": 0}
+
+    def iter_chunks(self, own_file, chunk_ids, first):
+        """
+        fileBase64 of chunk_ids[first:] in order; index 0 is the token
+        itself, whose data came with its metadata.
+        """
+        if first == 0:
+            yield own_file
+            first = 1
+        parent_id, child_ids = chunk_ids[0], chunk_ids[1:]
+        start = first - 1
+        if start >= len(child_ids):
+            return
+        # The first chunk sizes the ranged reads that follow.
+        sample = self.reader.chunk_range(parent_id, child_ids, start, start + 1)
+        step = self.reader.range_step(parent_id, sample[0])
+        ranges = iter([(s, min(s + step, len(child_ids))) for s in range(start + 1, len(child_ids), step)])
+        window = deque()
+        for s, e in ranges:
+            window.append(self.executor.submit(self.reader.chunk_range, parent_id, child_ids, s, e))
+            if len(window) >= PREFETCH:
+                break
+        chunks = sample
+        while True:
+            for chunk in chunks:
+                if isinstance(chunk, CallError):
+                    raise chunk
+                yield chunk
+            if not window:
+                return
+            chunks = window.popleft().result()
+            bounds = next(ranges, None)
+            if bounds is not None:
+                window.append(self.executor.submit(self.reader.chunk_range, parent_id, child_ids, *bounds))
+
+    def describe(self, token_id):
+        """
+        Read the token's metadata and child list and store metadata.json.
+        Returns (metadata, child_ids, (path, etag) of metadata.json).
+        """
+        try:
+            metadata = self.reader.call("getMetadata", token_id)
+        except CallError as e:
+            if "revert" not in str(e).lower():
+                raise
+            raise TokenNotFound(str(e))
+        child_ids = self.reader.children(token_id)
+        document = {"tokenId": token_id}
+        for name, value in zip(META_FIELDS[:9], metadata):
+            document[name] = value
+        document["image"] = f"data:image/jpeg;base64,{metadata[9]}"
+        document["children"] = len(child_ids)
+        return metadata, child_ids, self.cache.put(token_id, "json", json.dumps(document).encode())
+
+    def metadata(self, token_id):
+        found = self.cache.get(token_id, "json", self.ttl)
+        if found is not None:
+            self.stats["hits"] += 1
+            return found
+        return self.describe(token_id)[2]
+
+    def bcif(self, token_id):
+        """
+        (path, etag) of the cached data, or (None, TokenFetch) to stream
+        from while it is being read from the chain.
+        """
+        found = self.cache.get(token_id, "bcif", self.ttl)
+        if found is not None:
+            self.stats["hits"] += 1
+            return found
+        with self.lock:
+            fetch_lock = self.fetch_locks.setdefault(token_id, threading.Lock())
+        with fetch_lock:
+            found = self.cache.get(token_id, "bcif", self.ttl)
+            if found is not None:
+                return found
+            fetch = self.active.get(token_id)
+            if fetch is None:
+                metadata, child_ids, _ = self.describe(token_id)
+                fetch = TokenFetch(self, token_id, metadata[FILE_FIELD], child_ids)
+                self.active[token_id] = fetch
+                self.stats["resumed" if fetch.resumed else "fetches"] += 1
+                logging.info(f"Fetching token {token_id} ({metadata[0]}): {len(child_ids)} children"
+                             f"{f', resuming at chunk {len(fetch.offsets) - 1}' if fetch.resumed else ''}.")
+                threading.Thread(target=self._run, args=(fetch,), daemon=True).start()
+        self.stats["streamed"] += 1
+        return None, fetch
+
+    def _run(self, fetch):
+        started = time.time()
+        fetch.run()
+        with self.lock:
+            self.active.pop(fetch.token_id, None)
+        if fetch.done:
+            logging.info(f"Fetched token {fetch.token_id}: {fetch.available} bytes in {time.time() - started:.1f}s.")
+
+def parse_range(header, size):
+    """
+    Single "bytes=" range -> (start, end) with 'end' exclusive, None when
+    the header should be ignored, or ValueError when it cannot be satisfied.
+    'size' may be None while the total is unknown; open-ended and suffix
+    ranges then come back with end=None.
+    """
+    m = _RANGE.match(header.strip()) if header else None
+    if not m or m.groups() == ("", ""):
+        return None
+    first, last = m.groups()
+    if not first:
+        if size is None:
+            return -int(last), None
+        start, end = max(0, size - int(last)), size
+    else:
+        start = int(first)
+        end = int(last) + 1 if last else size
+        if end is not None and size is not None:
+            end = min(end, size)
+        if end is not None and end <= start:
+            raise ValueError(header)
+    if size is not None and start >= size:
+        raise ValueError(header)
+    return start, end
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive and chunked streaming
+    gateway = None  # set by serve()
+
+    def do_HEAD(self):
+        self.handle_token(body=False)
+
+    def do_GET(self):
+        self.handle_token(body=True)
+
+    def handle_token(self, body):
+        path = self.path.split("?", 1)[0]
+        m = _ROUTE.match(path)
+        if not m:
+            self.send_error(404, "Use /token/<id>.bcif or /token/<id>/metadata.json")
+            return
+        token_id = int(m.group(1))
+        kind = "bcif" if path.endswith(".bcif") else "json"
+        self._started = False
+        try:
+            if kind == "json":
+                file_path, etag = self.gateway.metadata(token_id)
+                self.send_file(token_id, kind, file_path, etag, body)
+                return
+            file_path, etag = self.gateway.bcif(token_id)
+            if file_path is None:
+                self.send_stream(token_id, etag, body)  # 'etag' is the TokenFetch
+            else:
+                self.send_file(token_id, kind, file_path, etag, body)
+        except TokenNotFound:
+            self.send_error(404, f"Token {token_id} does not exist")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client went away; a fetch keeps running
+        except Exception as e:
+            logging.error(f"Token {token_id}: {e}")
+            if self._started:
+                self.close_connection = True
+            else:
+                self.send_error(502, "Chain read failed")
+
+    def start(self, status, kind, token_id, etag=None):
+        self._started = True
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"public, max-age={self.gateway.ttl}")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "ETag, Content-Length, Content-Range, Accept-Ranges")
+        if status != 304:
+            self.send_header("Content-Type", KINDS[kind])
+        if kind == "bcif":
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Disposition", f'inline; filename="{token_id}.bcif"')
+
+    def send_file(self, token_id, kind, file_path, etag, body):
+        etag = f'"{etag}"'
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.gateway.stats["not_modified"] += 1
+            self.start(304, kind, token_id, etag)
+            self.end_headers()
+            return
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            span = None
+            if kind == "bcif" and self.headers.get("If-Range", etag) == etag:
+                try:
+                    span = parse_range(self.headers.get("Range"), size)
+                except ValueError:
+                    self.send_unsatisfiable(token_id, size)
+                    return
+            start, end = span or (0, size)
+            self.start(206 if span else 200, kind, token_id, etag)
+            if span:
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            self.send_header("Content-Length", str(end - start))
+            self.end_headers()
+            if body:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    block = f.read(min(STREAM_BLOCK, remaining))
+                    if not block:
+                        break
+                    self.wfile.write(block)
+                    remaining -= len(block)
+
+    def send_stream(self, token_id, fetch, body):
+        """
+        Serve a token that is still being fetched. Whole-file requests start
+        right away as a chunked response; a range waits for the chunks that
+        hold its last byte (or, if open-ended, for the total size).
+        """
+        # No ETag exists yet, so an If-Range can never match: send it all.
+        header = None if self.headers.get("If-Range") else self.headers.get("Range")
+        size = None
+        try:
+            span = parse_range(header, None)
+            if span is not None:
+                _, size = fetch.wait_for(span[1])
+                if size is not None:
+                    span = parse_range(header, size)
+        except ValueError:
+            self.send_unsatisfiable(token_id, size)
+            return
+
+        if span is None:
+            self.start(200, "bcif", token_id)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            if not body:
+                return
+            for block in fetch.stream(0):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(block), block))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        start, end = span
+        total = fetch.available if fetch.done else "*"
+        logging.info(f"Token {token_id}: bytes {start}-{end - 1} from chunks "
+                     f"{fetch.chunk_at(start)}-{fetch.chunk_at(end - 1)}.")
+        self.start(206, "bcif", token_id)
+        self.send_header("Content-Range", f"bytes {start}-{end - 1}/{total}")
+        self.send_header("Content-Length", str(end - start))
+        self.end_headers()
+        if body:
+            for block in fetch.stream(start, end):
+                self.wfile.write(block)
+
+    def send_unsatisfiable(self, token_id, size):
+        self.start(416, "bcif", token_id)
+        if size is not None:
+            self.send_header("Content-Range", f"bytes */{size}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, fmt, *args):
+        logging.info(f"{self.address_string()} {fmt % args}")
+
+def serve(reader, host, port, cache_dir=None, cache_limit=CACHE_LIMIT, ttl=TTL, workers=FETCH_WORKERS):
+    cache = TokenCache(os.path.join(cache_dir or GATEWAY_CACHE_DIR, reader.address.lower()), cache_limit)
+    GatewayHandler.gateway = Gateway(reader, cache, ttl, workers)
+    server = ThreadingHTTPServer((host, port), GatewayHandler)
+    logging.info(f"Gateway for {reader.address} on http://{host}:{port}/token/<id>.bcif "
+                 f"({len(cache.entries)} cached entries, {cache.size / 1e6:.1f} MB).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info(f"Gateway stats: {GatewayHandler.gateway.stats}")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+import os
+import csv
+import gzip
+import math
+import base64
+import random
+import logging
+import argparse
+from multiprocessing import Pool
+
+# --------------------------- CONFIGURATION ---------------------------
+# Writes a synthetic dataset in the layout mol_mint.py expects:
+#
+#   <out>/metadata.csv                          IDCODE, HEADER, ..., SEQUENCE
+#   <out>/images_230_base64/<id>.base64.txt     one thumbnail per IDCODE
+#   <out>/final_bcif_output/<id>.bcif.gz.base64             small structures
+#   <out>/final_bcif_output/<id>.bcif.gz.base64_partN       split structures
+#
+# Every structure is generated from its own RNG seeded with (seed, index), so
+# the output is identical for a given seed regardless of --workers.
+
+CSV_FIELDS = [
+    "IDCODE", "HEADER", "ACCESSION_DATE", "COMPOUND", "SOURCE",
+    "AUTHOR_LIST", "RESOLUTION", "EXPERIMENT_TYPE", "SEQUENCE",
+]
+
+CHUNK_SIZE      = 40_000      # base64 characters per _partN file
+MEDIAN_BYTES    = 96 * 1024   # median size of the .bcif.gz payload
+SIZE_SIGMA      = 1.1         # lognormal spread of structure sizes
+MAX_BYTES       = 32 * 1024 * 1024
+IMAGE_BYTES     = (6_000, 24_000)
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+HEADERS = [
+    "HYDROLASE", "TRANSFERASE", "OXIDOREDUCTASE", "LYASE", "ISOMERASE",
+    "LIGASE", "TRANSPORT PROTEIN", "SIGNALING PROTEIN", "IMMUNE SYSTEM",
+    "STRUCTURAL PROTEIN", "DNA BINDING PROTEIN", "VIRAL PROTEIN", "RIBOSOME",
+]
+EXPERIMENTS = [
+    ("X-RAY DIFFRACTION", 0.66),
+    ("ELECTRON MICROSCOPY", 0.26),
+    ("SOLUTION NMR", 0.07),
+    ("NEUTRON DIFFRACTION", 0.01),
+]
+ORGANISMS = [
+    ("HOMO SAPIENS", "HUMAN", "9606"),
+    ("MUS MUSCULUS", "MOUSE", "10090"),
+    ("ESCHERICHIA COLI", "E. COLI", "562"),
+    ("SACCHAROMYCES CEREVISIAE", "BAKER'S YEAST", "4932"),
+    ("THERMUS THERMOPHILUS", "THERMUS THERMOPHILUS", "274"),
+    ("SARS-COV-2", "SARS-COV-2", "2697049"),
+]
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+SURNAMES = [
+    "SMITH", "WANG", "MUELLER", "GARCIA", "TANAKA", "KOWALSKI", "IVANOV",
+    "ROSSI", "NGUYEN", "SILVA", "KIM", "DUBOIS", "JOHANSSON", "OKAFOR",
+]
+IDCODE_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+
+def make_idcode(index):
+    """
+    PDB-style four character IDCODE (digit 1-9 + three alphanumerics).
+    All codes have the same length so the '<id>*' globs never overlap.
+    """
+    if index >= 9 * 36 ** 3:
+        raise ValueError("IDCODE space exhausted (max 419904 structures).")
+    # Spread consecutive indexes over the space so IDs look less sequential.
+    n = (index * 7919) % (9 * 36 ** 3)
+    chars = []
+    for _ in range(3):
+        n, r = divmod(n, 36)
+        chars.append(IDCODE_ALPHABET[r])
+    return str(n + 1) + "".join(reversed(chars))
+
+def make_sequence(rng):
+    chains = max(1, min(24, int(rng.lognormvariate(0.4, 0.8))))
+    residues = []
+    for _ in range(chains):
+        length = max(8, min(20_000, int(rng.lognormvariate(math.log(280), 0.7))))
+        residues.append("".join(rng.choices(AMINO_ACIDS, k=length)))
+    return "/".join(residues)
+
+def make_row(rng, idcode):
+    experiment = rng.choices([e for e, _ in EXPERIMENTS], weights=[w for _, w in EXPERIMENTS])[0]
+    if experiment == "SOLUTION NMR":
+        resolution = ""
+    elif experiment == "ELECTRON MICROSCOPY":
+        resolution = f"{rng.uniform(1.8, 6.0):.2f}"
+    else:
+        resolution = f"{rng.uniform(0.9, 3.5):.2f}"
+    organism, common, taxid = rng.choice(ORGANISMS)
+    molecule = rng.choice(HEADERS).lower()
+    authors = ",".join(
+        f"{rng.choice('ABCDEFGHJKLMNPRSTW')}.{rng.choice('ABCDEFGHJKLMNPRSTW')}.{rng.choice(SURNAMES)}"
+        for _ in range(rng.randint(1, 12))
+    )
+    return {
+        "IDCODE": idcode,
+        "HEADER": rng.choice(HEADERS),
+        "ACCESSION_DATE": f"{rng.randint(1, 28):02d}-{rng.choice(MONTHS)}-{rng.randint(0, 99):02d}",
+        "COMPOUND": f"MOL_ID: 1; MOLECULE: {molecule.upper()}; CHAIN: A; ENGINEERED: YES",
+        "SOURCE": f"MOL_ID: 1; ORGANISM_SCIENTIFIC: {organism}; ORGANISM_COMMON: {common}; ORGANISM_TAXID: {taxid}",
+        "AUTHOR_LIST": authors,
+        "RESOLUTION": resolution,
+        "EXPERIMENT_TYPE": experiment,
+        "SEQUENCE": make_sequence(rng),
+    }
+
+def make_image_base64(rng):
+    # JPEG start/end markers around random bytes: enough for size and
+    # payload tests, not a decodable image.
+    body = rng.randbytes(rng.randint(*IMAGE_BYTES))
+    return base64.b64encode(b"\xff\xd8\xff\xe0" + body + b"\xff\xd9").decode()
+
+def make_structure_base64(rng, median_bytes, max_bytes):
+    size = int(rng.lognormvariate(math.log(median_bytes), SIZE_SIGMA))
+    size = max(2_048, min(max_bytes, size))
+    # compresslevel=0 keeps this a valid gzip stream (stored blocks) without
+    # paying for compression of random data.
+    return base64.b64encode(gzip.compress(rng.randbytes(size), compresslevel=0, mtime=0)).decode()
+
+def split_chunks(data, chunk_size):
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+def write_text(path, data):
+    with open(path, "w") as f:
+        f.write(data)
+
+def generate_structure(job):
+    index, seed, out_dir, chunk_size, median_bytes, max_bytes = job
+    rng = random.Random(f"{seed}:{index}")
+    idcode = make_idcode(index)
+    row = make_row(rng, idcode)
+    lower = idcode.lower()
+
+    write_text(os.path.join(out_dir, "images_230_base64", f"{lower}.base64.txt"), make_image_base64(rng))
+
+    data = make_structure_base64(rng, median_bytes, max_bytes)
+    molecular_dir = os.path.join(out_dir, "final_bcif_output")
+    if len(data) <= chunk_size:
+        write_text(os.path.join(molecular_dir, f"{lower}.bcif.gz.base64"), data)
+        parts = 0
+    else:
+        chunks = split_chunks(data, chunk_size)
+        for n, chunk in enumerate(chunks, start=1):
+            write_text(os.path.join(molecular_dir, f"{lower}.bcif.gz.base64_part{n}"), chunk)
+        parts = len(chunks)
+    return row, len(data), parts
+
+def generate_dataset(out_dir, count, seed=0, chunk_size=CHUNK_SIZE, median_bytes=MEDIAN_BYTES,
+                     max_bytes=MAX_BYTES, workers=None):
+    os.makedirs(os.path.join(out_dir, "images_230_base64"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "final_bcif_output"), exist_ok=True)
+
+    jobs = ((i, seed, out_dir, chunk_size, median_bytes, max_bytes) for i in range(count))
+    total_chars = 0
+    total_parts = 0
+    split = 0
+
+    with open(os.path.join(out_dir, "metadata.csv"), "w", newline="") as f, Pool(workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for i, (row, chars, parts) in enumerate(pool.imap(generate_structure, jobs, chunksize=64), start=1):
+            writer.writerow(row)
+            total_chars += chars
+            total_parts += parts
+            split += 1 if parts else 0
+            if i % 10_000 == 0:
+                logging.info(f"Generated {i}/{count} structures.")
+
+    logging.info(
+        f"Wrote {count} structures to {out_dir}: {split} split into {total_parts} parts, "
+        f"{total_chars / 1e6:.1f} M base64 characters of molecular data."
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic MolNFT dataset for scale testing.")
+    parser.add_argument("out_dir", help="Output directory (metadata.csv, images_230_base64/, final_bcif_output/).")
+    parser.add_argument("-n", "--count", type=int, default=1000, help="Number of structures. Default: 1000")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed. Default: 0")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"Base64 characters per _partN file. Default: {CHUNK_SIZE}")
+    parser.add_argument("--median-kb", type=float, default=MEDIAN_BYTES / 1024,
+                        help=f"Median .bcif.gz size in KiB. Default: {MEDIAN_BYTES // 1024}")
+    parser.add_argument("--max-mb", type=float, default=MAX_BYTES / 1024 / 1024,
+                        help=f"Largest .bcif.gz size in MiB. Default: {MAX_BYTES // 1024 // 1024}")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes. Default: all cores")
+    args = parser.parse_args()
+
+    generate_dataset(
+        args.out_dir,
+        args.count,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        median_bytes=int(args.median_kb * 1024),
+        max_bytes=int(args.max_mb * 1024 * 1024),
+        workers=args.workers,
+    )
+
+if __name__ == "__main__":
+    main()
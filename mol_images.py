@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+import io
+import os
+import glob
+import base64
+import hashlib
+import logging
+from multiprocessing import Pool
+
+from mol_abi import CACHE_DIR
+
+# --------------------------- IMAGE PREPARATION ---------------------------
+# Turns PNG/JPEG/WebP renders into the imageBase64 payload a parent token
+# carries: fit into a TARGET_SIZE square, flatten onto white, re-encode as
+# JPEG (tokenURI and the viewer declare data:image/jpeg) at the highest
+# quality whose base64 text fits MAX_IMAGE_BYTES, shrinking the image
+# further if even MIN_QUALITY does not fit. Encoding happens in memory in a
+# process pool; results are cached as *.base64.txt under CACHE_DIR/images,
+# keyed by the SHA-256 of the source bytes and the settings, so the rest of
+# the tool reads them like the hand-made thumbnails.
+#
+# Needs Pillow (pip install Pillow), imported only when an image is encoded.
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+IMAGE_CACHE_DIR  = os.path.join(CACHE_DIR, "images")
+TARGET_SIZE      = 230
+MAX_IMAGE_BYTES  = 32_768  # base64 characters, i.e. bytes stored on chain
+MIN_QUALITY      = 30
+MAX_QUALITY      = 95
+SHRINK_STEP      = 0.8
+
+def find_source_image(images_dir, idcode):
+    """
+    PNG/JPEG/WebP file for 'idcode' in 'images_dir', or None.
+    """
+    for name in (idcode.lower(), idcode):
+        files = sorted(f for f in glob.glob(os.path.join(images_dir, f"{name}*"))
+                       if f.lower().endswith(IMAGE_EXTENSIONS))
+        if files:
+            # Prefer a file without "_part", like the *.base64.txt lookup
+            return next((f for f in files if "_part" not in os.path.basename(f)), files[0])
+    return None
+
+def cache_key(source, size, max_bytes):
+    digest = hashlib.sha256(source)
+    digest.update(f":{size}:{max_bytes}:{MIN_QUALITY}:{MAX_QUALITY}".encode())
+    return digest.hexdigest()
+
+def cache_path(key):
+    return os.path.join(IMAGE_CACHE_DIR, f"{key}.base64.txt")
+
+def _jpeg_base64(image, quality):
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return base64.b64encode(buf.getvalue()).decode()
+
+def encode_image(source, size=TARGET_SIZE, max_bytes=MAX_IMAGE_BYTES):
+    """
+    Source image bytes -> (base64 JPEG text, (width, height), quality).
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(source))
+    image.load()
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    else:
+        image = image.convert("RGB")
+    image.thumbnail((size, size), Image.LANCZOS)
+
+    while True:
+        # Highest quality that fits, by binary search over MIN..MAX_QUALITY
+        lo, hi = MIN_QUALITY, MAX_QUALITY
+        best = None
+        while lo <= hi:
+            quality = (lo + hi) // 2
+            data = _jpeg_base64(image, quality)
+            if len(data) <= max_bytes:
+                best = (data, quality)
+                lo = quality + 1
+            else:
+                hi = quality - 1
+        if best is not None:
+            return best[0], image.size, best[1]
+        if min(image.size) <= 16:
+            raise ValueError(f"cannot fit under {max_bytes} bytes")
+        image = image.resize((max(1, int(image.width * SHRINK_STEP)), max(1, int(image.height * SHRINK_STEP))),
+                             Image.LANCZOS)
+
+def prepare_image(job):
+    """
+    Worker entry point: (idcode, path, size, max_bytes) -> (idcode, cached
+    path or None, info). Errors are returned rather than raised so one bad
+    render does not stop the pool.
+    """
+    idcode, path, size, max_bytes = job
+    try:
+        with open(path, "rb") as f:
+            source = f.read()
+        target = cache_path(cache_key(source, size, max_bytes))
+        if os.path.exists(target):
+            return idcode, target, "cached"
+        data, dims, quality = encode_image(source, size, max_bytes)
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(data)
+        os.replace(tmp, target)
+        return idcode, target, f"{dims[0]}x{dims[1]} q{quality}, {len(source)} -> {len(data)} bytes"
+    except ImportError:
+        return idcode, None, "Pillow is not installed (pip install Pillow)"
+    except Exception as e:
+        return idcode, None, f"{type(e).__name__}: {e}"
+
+def prepare_images(sources, size=TARGET_SIZE, max_bytes=MAX_IMAGE_BYTES, workers=None):
+    """
+    'sources' maps IDCODE -> source image path. Returns IDCODE -> cached
+    *.base64.txt path for every image that could be prepared.
+    """
+    jobs = [(idcode, path, size, max_bytes) for idcode, path in sources.items()]
+    if not jobs:
+        return {}
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    prepared = {}
+    with Pool(workers) as pool:
+        for idcode, target, info in pool.imap_unordered(prepare_image, jobs):
+            if target is None:
+                logging.error(f"Could not prepare image for {idcode} from {sources[idcode]}: {info}")
+                continue
+            logging.info(f"Image for {idcode}: {info}")
+            prepared[idcode] = target
+    return prepared
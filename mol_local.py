@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+import os
+import json
+import logging
+
+# --------------------------- IN-PROCESS CHAIN ---------------------------
+# `--backend local`: instead of RPC_URL, the commands talk to a py-evm chain
+# inside the process (eth-tester), mining every transaction as soon as it is
+# sent. One of the contract variants is deployed from its precompiled
+# artifact by the minting account, which is funded from the tester's genesis
+# accounts first, so the account is owner (and editor) of the contract just
+# as on a fresh deployment. The chain lives as long as the process.
+#
+# Artifacts are read from ARTIFACTS_DIR/<variant>.json, in any of these
+# layouts:
+#
+#   solc --combined-json abi,bin    {"contracts": {"molnft.sol:MolNFT": {"bin": ...}}}
+#   Hardhat                         {"abi": [...], "bytecode": "0x..."}
+#   Foundry (forge build)           {"abi": [...], "bytecode": {"object": "0x..."}}
+#
+# e.g. with OpenZeppelin 5 installed under node_modules:
+#
+#   solc --combined-json abi,bin --optimize --base-path . --include-path node_modules \
+#        molnft_editor_version_batch.sol > artifacts/molnft_editor_version_batch.json
+#
+# Needs eth-tester with py-evm (pip install "eth-tester[py-evm]"), imported
+# when the chain starts.
+
+VARIANTS        = {
+    "molnft":  "molnft.sol",
+    "editor":  "molnft_editor_version.sol",
+    "batch":   "molnft_editor_version_batch.sol",
+    "sstore2": "molnft_editor_version_sstore2.sol",
+}
+ARTIFACTS_DIR   = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+CONTRACT_NAME   = "MolNFT"
+LOCAL_GAS_LIMIT = 1_000_000_000  # a block holds any chunk the chunk planner allows on chain
+FUNDING         = 10 ** 23       # wei sent to the minting account (a tenth of a genesis account)
+DEPLOY_GAS      = 30_000_000
+
+def artifact_path(variant):
+    return os.path.join(ARTIFACTS_DIR, os.path.splitext(VARIANTS[variant])[0] + ".json")
+
+def load_artifact(path, name=CONTRACT_NAME):
+    """
+    Creation bytecode (bytes) of contract 'name' from a solc, Hardhat or
+    Foundry artifact.
+    """
+    with open(path, "r") as f:
+        artifact = json.load(f)
+    if "contracts" in artifact:
+        matches = [c for key, c in artifact["contracts"].items() if key.split(":")[-1] == name]
+        if not matches:
+            raise ValueError(f"{path} has no contract {name}")
+        code = matches[0].get("bin") or matches[0].get("evm", {}).get("bytecode", {}).get("object")
+    else:
+        code = artifact.get("bytecode")
+        if isinstance(code, dict):
+            code = code.get("object")
+    if not code:
+        raise ValueError(f"{path} holds no creation bytecode")
+    if "__" in code:
+        raise ValueError(f"{path} has unlinked library references")
+    return bytes.fromhex(code[2:] if code.startswith("0x") else code)
+
+def _provider(tester):
+    from web3 import EthereumTesterProvider
+
+    class LocalProvider(EthereumTesterProvider):
+        # Raw requests (mol_rpc, mol_confirm) bypass web3's request
+        # formatters, and eth-tester only takes block numbers as integers.
+        def make_request(self, method, params):
+            if method == "eth_getBlockByNumber" and isinstance(params[0], str) and params[0].startswith("0x"):
+                params = [int(params[0], 16)] + list(params[1:])
+            return super().make_request(method, params)
+
+    return LocalProvider(tester)
+
+def start_chain(account, bytecode, gas_price):
+    """
+    Start an in-process chain, fund 'account' and deploy 'bytecode' from it.
+    Returns (web3, contract address).
+    """
+    from web3 import Web3
+    from eth_tester import EthereumTester, PyEVMBackend
+
+    params = PyEVMBackend.generate_genesis_params(overrides={"gas_limit": LOCAL_GAS_LIMIT})
+    tester = EthereumTester(PyEVMBackend(genesis_parameters=params))
+    web3 = Web3(_provider(tester))
+
+    funder = web3.eth.accounts[0]
+    web3.eth.wait_for_transaction_receipt(
+        web3.eth.send_transaction({"from": funder, "to": account.address, "value": FUNDING}))
+
+    tx = {
+        "chainId": web3.eth.chain_id,
+        "data": bytecode,
+        "value": 0,
+        "gas": DEPLOY_GAS,
+        "gasPrice": gas_price,
+        "nonce": web3.eth.get_transaction_count(account.address),
+    }
+    signed = account.sign_transaction(tx)
+    receipt = web3.eth.wait_for_transaction_receipt(web3.eth.send_raw_transaction(signed.raw_transaction))
+    if receipt.status != 1 or not receipt.contractAddress:
+        raise RuntimeError(f"deployment reverted (gas used {receipt.gasUsed})")
+    logging.info(f"Local chain {web3.eth.chain_id}: deployed {len(bytecode)} bytes of creation code at "
+                 f"{receipt.contractAddress} for {receipt.gasUsed} gas; {account.address} funded.")
+    return web3, receipt.contractAddress
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import re
+import sys
+import logging
+import resource
+import threading
+
+# --------------------------- IN-FLIGHT BYTE BUDGET ---------------------------
+# Caps the payload bytes held by the signing pipeline at once (--max-rss).
+# A transaction is charged when its job is handed to a worker (or, for mints
+# signed on the main thread, when it is built) and released once it has been
+# broadcast; in between the charge moves through the stages below so peak
+# usage can be reported per stage.
+#
+#   signing    job queued, in a worker or being built (file data, calldata, signed bytes)
+#   signed     signed bytes waiting for their nonce to come up
+#   broadcast  handed to the caller for send_raw_transaction (raw + hex body)
+#
+# The charge is an estimate: IN_FLIGHT_FACTOR copies of the payload, which
+# covers the largest stage (source string + calldata + raw, or raw + hex JSON).
+
+IN_FLIGHT_FACTOR = 3
+STAGES = ("signing", "signed", "broadcast")
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+
+def parse_size(text):
+    """
+    "512M", "2G", "1.5GiB", "1000000" -> bytes
+    """
+    m = _SIZE.match(text)
+    if not m:
+        raise ValueError(f"Invalid size: {text}")
+    number, unit = m.groups()
+    return int(float(number) * 1024 ** " kmgt".index(unit.lower() or " "))
+
+def peak_rss():
+    """
+    Peak resident set size of this process and of finished children, in bytes.
+    """
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    unit = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return own, children
+
+class ByteBudget:
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.stage_in_use = {stage: 0 for stage in STAGES}
+        self.stage_peak = {stage: 0 for stage in STAGES}
+        self.waits = 0
+        self.lock = threading.Lock()
+
+    def try_acquire(self, nbytes, stage, force=False):
+        """
+        Charge 'nbytes' to 'stage' if it fits under the limit. 'force' admits
+        it anyway, so a single payload larger than the limit can still make
+        progress when nothing else is in flight.
+        """
+        with self.lock:
+            if not force and self.limit is not None and self.in_use + nbytes > self.limit:
+                self.waits += 1
+                return False
+            self.in_use += nbytes
+            self.peak = max(self.peak, self.in_use)
+            self._add(stage, nbytes)
+            return True
+
+    def move(self, nbytes, from_stage, to_stage):
+        with self.lock:
+            self._add(from_stage, -nbytes)
+            self._add(to_stage, nbytes)
+
+    def release(self, nbytes, stage):
+        with self.lock:
+            self.in_use -= nbytes
+            self._add(stage, -nbytes)
+
+    def _add(self, stage, nbytes):
+        self.stage_in_use[stage] += nbytes
+        self.stage_peak[stage] = max(self.stage_peak[stage], self.stage_in_use[stage])
+
+    def log_report(self):
+        limit = f"{self.limit / 1e6:.1f} MB" if self.limit is not None else "unlimited"
+        stages = ", ".join(f"{s} {self.stage_peak[s] / 1e6:.1f} MB" for s in STAGES)
+        own, children = peak_rss()
+        logging.info(f"In-flight payload peak {self.peak / 1e6:.1f} MB of {limit} ({stages}); "
+                     f"{self.waits} submissions deferred. Peak RSS: main {own / 1e6:.1f} MB, "
+                     f"workers {children / 1e6:.1f} MB.")
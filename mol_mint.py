@@ -4,17 +4,31 @@ import csv
 csv.field_size_limit(sys.maxsize)  # Increase CSV field size limit
 
 import os
-import json
 import glob
 import re
 import logging
-from web3 import Web3
+import argparse
+import importlib.util
+
+from mol_profile import StageProfiler, NULL_PROFILER
+from mol_sign import SigningPool, estimate_mint_gas, LAYOUTS
+from mol_memory import ByteBudget, IN_FLIGHT_FACTOR, parse_size
+from mol_confirm import BlockConfirmer
+from mol_nonce import NonceManager
+from mol_codec import parse_codecs
+
+# web3 is imported inside the commands that talk to a node, so offline
+# commands (plan, validate, abi) start without loading it.
 
 # --------------------------- CONFIGURATION ---------------------------
 RPC_URL = "https://rpc.genesisl1.org"
 CONTRACT_ADDRESS = "ADDRESS_OF_MOLNFT_SMART_CONTRACT"
 CHAIN_ID = 29
-GAS_PRICE = Web3.to_wei("51", "gwei")
+GAS_PRICE = 51 * 10**9  # 51 gwei
+
+# Multicall3 aggregator used by the bulk read commands (verify, sync, export,
+# gateway); None sends plain JSON-RPC batches. Override with --multicall.
+MULTICALL_ADDRESS = None
 
 FIRST_OWNER = "ENTER_FIRST_NFT_OWNER_HERE"
 PRIVATE_KEY = "PRIVATE_KEY_OF_DEPLOYER_OR_EDITOR"  # Insert your private key here, NEVER SHARE YOUR PRIVATE KEY! DEPLOY IN SAFE ENVIRONMENT!
@@ -25,1642 +39,83 @@ MOLECULAR_DIR= "example/final_bcif_output"
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 
-# --------------------------- CONTRACT ABI ---------------------------
-CONTRACT_ABI = json.loads(r'''
-[
-	{
-		"inputs": [],
-		"name": "ERC721EnumerableForbiddenBatchMint",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "sender",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			},
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			}
-		],
-		"name": "ERC721IncorrectOwner",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "operator",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "ERC721InsufficientApproval",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "approver",
-				"type": "address"
-			}
-		],
-		"name": "ERC721InvalidApprover",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "operator",
-				"type": "address"
-			}
-		],
-		"name": "ERC721InvalidOperator",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			}
-		],
-		"name": "ERC721InvalidOwner",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "receiver",
-				"type": "address"
-			}
-		],
-		"name": "ERC721InvalidReceiver",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "sender",
-				"type": "address"
-			}
-		],
-		"name": "ERC721InvalidSender",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "ERC721NonexistentToken",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "index",
-				"type": "uint256"
-			}
-		],
-		"name": "ERC721OutOfBoundsIndex",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			}
-		],
-		"name": "OwnableInvalidOwner",
-		"type": "error"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "account",
-				"type": "address"
-			}
-		],
-		"name": "OwnableUnauthorizedAccount",
-		"type": "error"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "approved",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "Approval",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "operator",
-				"type": "address"
-			},
-			{
-				"indexed": false,
-				"internalType": "bool",
-				"name": "approved",
-				"type": "bool"
-			}
-		],
-		"name": "ApprovalForAll",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			},
-			{
-				"indexed": true,
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			}
-		],
-		"name": "ChildNFTMinted",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "account",
-				"type": "address"
-			}
-		],
-		"name": "EditorAdded",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "account",
-				"type": "address"
-			}
-		],
-		"name": "EditorRemoved",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "previousOwner",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "newOwner",
-				"type": "address"
-			}
-		],
-		"name": "OwnershipTransferred",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "ParentNFTMinted",
-		"type": "event"
-	},
-	{
-		"anonymous": false,
-		"inputs": [
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "from",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"indexed": true,
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "Transfer",
-		"type": "event"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "account",
-				"type": "address"
-			}
-		],
-		"name": "addEditor",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "approve",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "from",
-				"type": "address"
-			},
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"name": "batchTransferFrom",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "string",
-				"name": "IDCODE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "HEADER",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "ACCESSION_DATE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "COMPOUND",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SOURCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "AUTHOR_LIST",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "RESOLUTION",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "EXPERIMENT_TYPE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SEQUENCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "imageBase64",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "fileBase64",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			}
-		],
-		"name": "mintNFT",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "account",
-				"type": "address"
-			}
-		],
-		"name": "removeEditor",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "renounceOwnership",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "from",
-				"type": "address"
-			},
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "safeTransferFrom",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "from",
-				"type": "address"
-			},
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			},
-			{
-				"internalType": "bytes",
-				"name": "data",
-				"type": "bytes"
-			}
-		],
-		"name": "safeTransferFrom",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "operator",
-				"type": "address"
-			},
-			{
-				"internalType": "bool",
-				"name": "approved",
-				"type": "bool"
-			}
-		],
-		"name": "setApprovalForAll",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "bool",
-				"name": "status",
-				"type": "bool"
-			}
-		],
-		"name": "setOnlyDeployerCanMint",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "from",
-				"type": "address"
-			},
-			{
-				"internalType": "address",
-				"name": "to",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "transferFrom",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "newOwner",
-				"type": "address"
-			}
-		],
-		"name": "transferOwnership",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			},
-			{
-				"internalType": "string",
-				"name": "IDCODE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "HEADER",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "ACCESSION_DATE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "COMPOUND",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SOURCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "AUTHOR_LIST",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "RESOLUTION",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "EXPERIMENT_TYPE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SEQUENCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "imageBase64",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "fileBase64",
-				"type": "string"
-			}
-		],
-		"name": "updateMetadata",
-		"outputs": [],
-		"stateMutability": "nonpayable",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"stateMutability": "nonpayable",
-		"type": "constructor"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			}
-		],
-		"name": "balanceOf",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "getApproved",
-		"outputs": [
-			{
-				"internalType": "address",
-				"name": "",
-				"type": "address"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			}
-		],
-		"name": "getChildren",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "childIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "getChildrenPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "childIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			}
-		],
-		"name": "getCombinedData",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "combinedFileBase64",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "parentId",
-				"type": "uint256"
-			}
-		],
-		"name": "getEntireNFT",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "IDCODE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "HEADER",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "ACCESSION_DATE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "COMPOUND",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SOURCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "AUTHOR_LIST",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "RESOLUTION",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "EXPERIMENT_TYPE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SEQUENCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "imageBase64",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "combinedFileBase64",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "getMetadata",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "IDCODE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "HEADER",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "ACCESSION_DATE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "COMPOUND",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SOURCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "AUTHOR_LIST",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "RESOLUTION",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "EXPERIMENT_TYPE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "SEQUENCE",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "imageBase64",
-				"type": "string"
-			},
-			{
-				"internalType": "string",
-				"name": "fileBase64",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "getParent",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"internalType": "address",
-				"name": "operator",
-				"type": "address"
-			}
-		],
-		"name": "isApprovedForAll",
-		"outputs": [
-			{
-				"internalType": "bool",
-				"name": "",
-				"type": "bool"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "name",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "nextChildId",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "nextNFTId",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "onlyDeployerCanMint",
-		"outputs": [
-			{
-				"internalType": "bool",
-				"name": "",
-				"type": "bool"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "owner",
-		"outputs": [
-			{
-				"internalType": "address",
-				"name": "",
-				"type": "address"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "ownerOf",
-		"outputs": [
-			{
-				"internalType": "address",
-				"name": "",
-				"type": "address"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByACCESSION_DATE",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByACCESSION_DATEPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByAUTHOR_LIST",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByAUTHOR_LISTPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByCOMPOUND",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByCOMPOUNDPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByEXPERIMENT_TYPE",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByEXPERIMENT_TYPEPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByHEADER",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByHEADERPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByIDCODE",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByIDCODEPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchByRESOLUTION",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchByRESOLUTIONPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchBySEQUENCE",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchBySEQUENCEPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			}
-		],
-		"name": "searchBySOURCE",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "string",
-				"name": "searchTerm",
-				"type": "string"
-			},
-			{
-				"internalType": "uint256",
-				"name": "offset",
-				"type": "uint256"
-			},
-			{
-				"internalType": "uint256",
-				"name": "limit",
-				"type": "uint256"
-			}
-		],
-		"name": "searchBySOURCEPaginated",
-		"outputs": [
-			{
-				"internalType": "uint256[]",
-				"name": "tokenIds",
-				"type": "uint256[]"
-			},
-			{
-				"internalType": "uint256",
-				"name": "total",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "bytes4",
-				"name": "interfaceId",
-				"type": "bytes4"
-			}
-		],
-		"name": "supportsInterface",
-		"outputs": [
-			{
-				"internalType": "bool",
-				"name": "",
-				"type": "bool"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "symbol",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "index",
-				"type": "uint256"
-			}
-		],
-		"name": "tokenByIndex",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "tokenExists",
-		"outputs": [
-			{
-				"internalType": "bool",
-				"name": "",
-				"type": "bool"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "address",
-				"name": "owner",
-				"type": "address"
-			},
-			{
-				"internalType": "uint256",
-				"name": "index",
-				"type": "uint256"
-			}
-		],
-		"name": "tokenOfOwnerByIndex",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [
-			{
-				"internalType": "uint256",
-				"name": "tokenId",
-				"type": "uint256"
-			}
-		],
-		"name": "tokenURI",
-		"outputs": [
-			{
-				"internalType": "string",
-				"name": "",
-				"type": "string"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	},
-	{
-		"inputs": [],
-		"name": "totalSupply",
-		"outputs": [
-			{
-				"internalType": "uint256",
-				"name": "",
-				"type": "uint256"
-			}
-		],
-		"stateMutability": "view",
-		"type": "function"
-	}
-]
-''')
+# Replaced in main() when --profile is given
+PROFILER = NULL_PROFILER
+
+# IDCODE (upper case) -> cached *.base64.txt prepared from a PNG/JPEG/WebP
+# render; filled by prepare_source_images() for rows without a thumbnail.
+PREPARED_IMAGES = {}
+
+# Set by run_campaign(); receipts are matched against new blocks instead of
+# polling every transaction hash.
+CONFIRMER = None
+
+# In-flight payload budget (--max-rss), shared by the signing pool and the
+# transactions mint_transaction() signs on the main thread; set by run_campaign().
+BUDGET = ByteBudget()
+
+# Set by `--backend local`: creation-code artifact deployed into an
+# in-process chain by connect_web3() instead of connecting to RPC_URL.
+LOCAL_ARTIFACT = None
+
+# How the target contract stores fileBase64 (mol_sign.LAYOUTS), for the
+# offline gas limits of `sign`; set by --layout.
+STORAGE_LAYOUT = "slots"
+
+def connect_web3():
+    from web3 import Web3
+
+    if LOCAL_ARTIFACT is not None:
+        return connect_local()
+    web3 = Web3(Web3.HTTPProvider(RPC_URL))
+    if not web3.is_connected():
+        logging.error("Unable to connect to the Web3 provider.")
+        return None
+    logging.info("Connected to Web3 provider.")
+    return web3
+
+def connect_local():
+    """
+    Start an in-process chain with the contract deployed from LOCAL_ARTIFACT
+    by the minting account, and point the configuration at it. Without a
+    usable PRIVATE_KEY/FIRST_OWNER a throwaway key mints to itself.
+    """
+    global CONTRACT_ADDRESS, CHAIN_ID, PRIVATE_KEY, FIRST_OWNER
+    from web3 import Web3
+    from eth_account import Account
+    from mol_local import load_artifact, start_chain
+
+    if importlib.util.find_spec("eth_tester") is None:
+        logging.error('--backend local needs eth-tester: pip install "eth-tester[py-evm]"')
+        return None
+    try:
+        bytecode = load_artifact(LOCAL_ARTIFACT)
+    except (OSError, ValueError) as e:
+        logging.error(f"Cannot load contract artifact: {e}")
+        return None
+    try:
+        account = Account.from_key(PRIVATE_KEY)
+    except Exception:
+        account = Account.create()
+        PRIVATE_KEY = "0x" + bytes(account.key).hex()
+        logging.info(f"Using throwaway key for local chain: {account.address}")
+    if not Web3.is_address(FIRST_OWNER):
+        FIRST_OWNER = account.address
+    try:
+        web3, CONTRACT_ADDRESS = start_chain(account, bytecode, GAS_PRICE)
+    except Exception as e:
+        logging.error(f"Could not deploy {LOCAL_ARTIFACT} on the local chain: {e}")
+        return None
+    CHAIN_ID = web3.eth.chain_id
+    return web3
 
 def load_contract(web3):
+    from web3 import Web3
+    from mol_abi import load_abi
+
     return web3.eth.contract(
         address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-        abi=CONTRACT_ABI
+        abi=load_abi()
     )
 
 def read_csv_data(csv_file):
@@ -1674,35 +129,43 @@ def read_csv_data(csv_file):
 
 def read_file_contents(file_path):
     try:
-        with open(file_path, "r") as f:
+        with PROFILER.stage("read"), open(file_path, "r") as f:
             return f.read().strip()
     except Exception as e:
         logging.error(f"Error reading file {file_path}: {e}")
         return None
 
-def get_image_for_idcode(idcode):
+def find_image_file(idcode):
     idcode_lower = idcode.lower()
-    pattern = os.path.join(IMAGES_DIR, f"{idcode_lower}*.base64.txt")
-    files = glob.glob(pattern)
-    if not files:
-        pattern = os.path.join(IMAGES_DIR, f"{idcode}*.base64.txt")
+    with PROFILER.stage("glob"):
+        pattern = os.path.join(IMAGES_DIR, f"{idcode_lower}*.base64.txt")
         files = glob.glob(pattern)
         if not files:
-            logging.error(f"No image file found for IDCODE {idcode}")
-            return None
+            pattern = os.path.join(IMAGES_DIR, f"{idcode}*.base64.txt")
+            files = glob.glob(pattern)
+            if not files:
+                return PREPARED_IMAGES.get(idcode.upper())
     # Prefer a file without "_part"
     for file in files:
         if "_part" not in os.path.basename(file):
-            return read_file_contents(file)
-    return read_file_contents(files[0])
+            return file
+    return files[0]
+
+def get_image_for_idcode(idcode):
+    image_file = find_image_file(idcode)
+    if image_file is None:
+        logging.error(f"No image file found for IDCODE {idcode}")
+        return None
+    return read_file_contents(image_file)
 
 def get_molecular_files_for_idcode(idcode):
     idcode_lower = idcode.lower()
-    pattern = os.path.join(MOLECULAR_DIR, f"{idcode_lower}*.bcif.gz.base64*")
-    files = glob.glob(pattern)
-    if not files:
-        pattern = os.path.join(MOLECULAR_DIR, f"{idcode}*.bcif.gz.base64*")
+    with PROFILER.stage("glob"):
+        pattern = os.path.join(MOLECULAR_DIR, f"{idcode_lower}*.bcif.gz.base64*")
         files = glob.glob(pattern)
+        if not files:
+            pattern = os.path.join(MOLECULAR_DIR, f"{idcode}*.bcif.gz.base64*")
+            files = glob.glob(pattern)
         if not files:
             logging.error(f"No molecular data file found for IDCODE {idcode}")
             return None, []
@@ -1719,74 +182,1011 @@ def get_molecular_files_for_idcode(idcode):
     parts.sort(key=lambda x: x[0])
     return parent_file, [f for _, f in parts]
 
-def mint_transaction(web3, func, account, nonce):
+def mint_transaction(web3, func, account, nonces, retries=1):
     """
     Build, sign, and send a transaction in snake_case. 
     'estimate_gas' -> 'build_transaction' -> 'sign_transaction' -> 'raw_transaction'.
+    The nonce comes from 'nonces' (mol_nonce.NonceManager) and stays used
+    once the node accepted the transaction, even if the receipt never comes.
+    The payload is charged to BUDGET from signing until the send returns.
     """
+    charge = sum(len(arg) for arg in func.args if isinstance(arg, str)) * IN_FLIGHT_FACTOR
     try:
-        gas_estimate = func.estimate_gas({'from': account.address})
+        with PROFILER.stage("estimate_gas"):
+            gas_estimate = func.estimate_gas({'from': account.address})
         gas_limit = gas_estimate + 10000
     except Exception as e:
         logging.warning(f"Gas estimate failed: {e}. Using 300000.")
         gas_limit = 300000
 
-    tx = func.build_transaction({
-        'chainId': CHAIN_ID,
-        'gas': gas_limit,
-        'gasPrice': GAS_PRICE,
-        'nonce': nonce
-    })
+    while True:
+        nonce = nonces.reserve()
+        # Nothing else is in flight on the main thread (the pool has drained),
+        # so the charge is forced through rather than waited for.
+        BUDGET.try_acquire(charge, "signing", force=True)
+        stage = "signing"
+        try:
+            with PROFILER.stage("build_transaction"):
+                tx = func.build_transaction({
+                    'chainId': CHAIN_ID,
+                    'gas': gas_limit,
+                    'gasPrice': GAS_PRICE,
+                    'nonce': nonce
+                })
 
-    # sign in snake_case
-    signed_tx = account.sign_transaction(tx)
+            # sign in snake_case
+            with PROFILER.stage("sign_transaction"):
+                signed_tx = account.sign_transaction(tx)
+            BUDGET.move(charge, stage, "broadcast")
+            stage = "broadcast"
 
-    # send the raw_transaction in snake_case
-    tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            # send the raw_transaction in snake_case
+            try:
+                with PROFILER.stage("send"):
+                    tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception as e:
+                kind = nonces.failed(nonce, e)
+                if kind == "known":
+                    tx_hash = signed_tx.hash
+                elif kind != "other" and retries > 0:
+                    retries -= 1
+                    continue
+                else:
+                    raise
+        finally:
+            # The raw bytes are not kept while waiting for the receipt.
+            signed_tx = None
+            BUDGET.release(charge, stage)
+        nonces.sent(nonce, tx_hash)
+        break
     logging.info(f"Transaction sent: {tx_hash.hex()}")
 
-    receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    try:
+        with PROFILER.stage("wait_receipt"):
+            if CONFIRMER is not None:
+                receipt = CONFIRMER.wait(tx_hash)
+            else:
+                receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    except Exception:
+        # The nonce is spent either way; make sure nothing behind it is stuck.
+        nonces.repair()
+        raise
     logging.info(f"Transaction confirmed: {receipt.transactionHash.hex()}")
     return receipt
 
-def main():
-    web3 = Web3(Web3.HTTPProvider(RPC_URL))
-    if not web3.is_connected():
-        logging.error("Unable to connect to the Web3 provider.")
-        return
-    logging.info("Connected to Web3 provider.")
+def estimate_child_gas(contract, account, parent_token_id, part_files):
+    """
+    One estimate per structure, made with its largest part, padded by 10% and
+    used as the gas limit for every child so the pool can sign without RPC.
+    """
+    largest = max(part_files, key=file_size)
+    part_data = read_file_contents(largest)
+    try:
+        func = contract.functions.mintNFT(
+            FIRST_OWNER,
+            "", "", "", "", "", "", "", "", "",
+            "",
+            part_data,
+            parent_token_id
+        )
+        with PROFILER.stage("estimate_gas"):
+            gas_estimate = func.estimate_gas({'from': account.address})
+        return int(gas_estimate * 1.1) + 10000
+    except Exception as e:
+        logging.warning(f"Gas estimate failed: {e}. Using 300000.")
+        return 300000
+
+def mint_children_parallel(web3, contract, account, pool, nonces, idcode, parent_token_id, sorted_parts):
+    """
+    Encode and sign all children of 'parent_token_id' in the signing pool with
+    nonces reserved up front, broadcast them in nonce order, then wait for
+    the receipts. Returns the number of parts that were not minted.
+    """
+    parts = []
+    for part_number, part_file in sorted_parts:
+        if file_size(part_file) == 0:
+            logging.error(f"Skipping child NFT {idcode} part {part_number}, read error.")
+            continue
+        parts.append((part_number, part_file))
+    if not parts:
+        return len(sorted_parts)
+
+    gas_limit = estimate_child_gas(contract, account, parent_token_id, [f for _, f in parts])
+    nonce = nonces.reserve(len(parts))
+    jobs = []
+    for i, (part_number, part_file) in enumerate(parts):
+        jobs.append({
+            "nonce": nonce + i,
+            "chain_id": CHAIN_ID,
+            "contract": contract.address,
+            "gas": gas_limit,
+            "gas_price": GAS_PRICE,
+            "owner": FIRST_OWNER,
+            "metadata": [""] * 9,
+            "image_base64": "",
+            "data_file": part_file,
+            "parent_id": parent_token_id,
+            "idcode": idcode,
+            "part": part_number,
+        })
+
+    sent = []
+    unsent = nonce
+    for signed in pool.sign(jobs):
+        try:
+            with PROFILER.stage("send"):
+                tx_hash = web3.eth.send_raw_transaction(signed["raw_transaction"])
+        except Exception as e:
+            # The remaining children were signed with the nonces after this
+            # one; failed() hands them back (or resyncs) unless the node had it.
+            if nonces.failed(signed["nonce"], e) != "known":
+                logging.error(f"Error sending child NFT for {idcode} part {signed['part']}: {e}")
+                break
+            tx_hash = signed["tx_hash"]
+        logging.info(f"Transaction sent: {tx_hash.hex()}")
+        nonces.sent(signed["nonce"], tx_hash)
+        CONFIRMER.add(tx_hash)
+        sent.append((signed["part"], tx_hash))
+        unsent = signed["nonce"] + 1
+    else:
+        if unsent < nonce + len(jobs):
+            # A signing job failed: hand back its nonce and the ones after it,
+            # or the next parent mint would leave a gap.
+            nonces.release(unsent)
+
+    lost = False
+    minted = 0
+    for part_number, tx_hash in sent:
+        try:
+            with PROFILER.stage("wait_receipt"):
+                receipt = CONFIRMER.wait(tx_hash)
+            if receipt.status == 1:
+                logging.info(f"Child NFT for {idcode} part {part_number} minted OK.")
+                minted += 1
+            else:
+                logging.error(f"Child NFT for {idcode} part {part_number} reverted: {tx_hash.hex()}")
+        except Exception as e:
+            logging.error(f"Error minting child NFT for {idcode} part {part_number}: {e}")
+            lost = True
+    if lost:
+        nonces.repair()
+    return len(sorted_parts) - minted
+
+def configure_paths(args):
+    global METADATA_CSV, IMAGES_DIR, MOLECULAR_DIR
+    METADATA_CSV = args.csv or METADATA_CSV
+    IMAGES_DIR = args.images_dir or IMAGES_DIR
+    MOLECULAR_DIR = args.molecular_dir or MOLECULAR_DIR
+
+def prepare_source_images(args):
+    """
+    Encode PNG/JPEG/WebP renders for CSV rows that have no *.base64.txt
+    thumbnail (mol_images), so find_image_file() picks up the cached result.
+    """
+    from mol_images import find_source_image, prepare_images
+
+    try:
+        rows = read_csv_data(METADATA_CSV)
+    except OSError:
+        return  # reported by the command itself
+    sources = {}
+    for row in rows:
+        idcode = (row.get("IDCODE") or "").strip()
+        if not idcode or idcode.upper() in sources or find_image_file(idcode) is not None:
+            continue
+        source = find_source_image(IMAGES_DIR, idcode)
+        if source is not None:
+            sources[idcode.upper()] = source
+    if sources:
+        logging.info(f"Preparing {len(sources)} images from PNG/JPEG/WebP renders.")
+        PREPARED_IMAGES.update(prepare_images(sources, args.image_size, args.image_max_bytes, args.image_workers))
+
+def iter_structures(rows):
+    """
+    Yield (idcode, row, image_file, parent_file, part_files) for each CSV row
+    without reading file contents. Shared by the offline commands.
+    """
+    for row in rows:
+        idcode = (row.get("IDCODE") or "").strip()
+        if not idcode:
+            yield None, row, None, None, []
+            continue
+        image_file = find_image_file(idcode)
+        parent_file, part_files = get_molecular_files_for_idcode(idcode)
+        yield idcode, row, image_file, parent_file, part_files
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def cmd_plan(args):
+    rows = read_csv_data(METADATA_CSV)
+    total_txs = 0
+    total_bytes = 0
+    print(f"{'IDCODE':<12} {'TXS':>6} {'PARTS':>6} {'IMAGE':>10} {'DATA':>14} {'SEQUENCE':>9}")
+    for idcode, row, image_file, parent_file, part_files in iter_structures(rows):
+        if idcode is None or image_file is None or (parent_file is None and not part_files):
+            continue
+        data_files = part_files or [parent_file]
+        data_bytes = sum(file_size(f) for f in data_files)
+        txs = 1 + len(part_files)
+        total_txs += txs
+        total_bytes += data_bytes + file_size(image_file)
+        print(f"{idcode:<12} {txs:>6} {len(part_files):>6} {file_size(image_file):>10} {data_bytes:>14} "
+              f"{len(row.get('SEQUENCE', '').strip()):>9}")
+    print(f"Total: {total_txs} transactions, {total_bytes} payload bytes for {len(rows)} CSV rows.")
+    return 0
+
+def cmd_validate(args):
+    rows = read_csv_data(METADATA_CSV)
+    problems = 0
+    seen = set()
+    for line, (idcode, row, image_file, parent_file, part_files) in enumerate(iter_structures(rows), start=2):
+        if idcode is None:
+            logging.error(f"CSV line {line}: missing/empty IDCODE.")
+            problems += 1
+            continue
+        if idcode.upper() in seen:
+            logging.error(f"CSV line {line}: duplicate IDCODE {idcode}.")
+            problems += 1
+        seen.add(idcode.upper())
+        if image_file is None:
+            logging.error(f"{idcode}: no image file in {IMAGES_DIR}.")
+            problems += 1
+        elif file_size(image_file) == 0:
+            logging.error(f"{idcode}: empty image file {image_file}.")
+            problems += 1
+        if parent_file is None and not part_files:
+            logging.error(f"{idcode}: no molecular data in {MOLECULAR_DIR}.")
+            problems += 1
+            continue
+        numbers = [int(re.search(r"_part(\d+)", os.path.basename(f)).group(1)) for f in part_files]
+        if numbers and numbers != list(range(numbers[0], numbers[0] + len(numbers))):
+            logging.error(f"{idcode}: part numbers are not contiguous: {numbers}.")
+            problems += 1
+        for f in part_files or [parent_file]:
+            if file_size(f) == 0:
+                logging.error(f"{idcode}: empty molecular file {f}.")
+                problems += 1
+    logging.info(f"Validated {len(rows)} rows: {problems} problem(s).")
+    return 1 if problems else 0
+
+def cmd_abi(args):
+    import mol_abi
+
+    if args.key:
+        results = mol_abi.lookup(args.key)
+        if not results:
+            logging.error(f"No ABI entry matches {args.key}.")
+            return 1
+    else:
+        table = mol_abi.selector_table()
+        results = [(kind[:-1], digest, record)
+                   for kind in ("functions", "events", "errors")
+                   for digest, record in table[kind].items()]
+    for kind, digest, record in results:
+        print(f"{kind:<9} {digest}  {record['signature']}")
+    return 0
+
+METADATA_FIELDS = [
+    "HEADER", "ACCESSION_DATE", "COMPOUND", "SOURCE",
+    "AUTHOR_LIST", "RESOLUTION", "EXPERIMENT_TYPE", "SEQUENCE",
+]
+
+def bundle_jobs(rows, first_nonce, first_token_id, first_child_id):
+    """
+    Turn CSV rows into signing jobs with contiguous nonces and the tokenIds
+    the contract will assign when the bundle is broadcast in order
+    (parents count up from nextNFTId, children from nextChildId).
+    """
+    nonce = first_nonce
+    token_id = first_token_id
+    child_id = first_child_id
+    base = {"chain_id": CHAIN_ID, "contract": CONTRACT_ADDRESS, "gas_price": GAS_PRICE, "owner": FIRST_OWNER}
+
+    for idcode, row, image_file, parent_file, part_files in iter_structures(rows):
+        if idcode is None:
+            logging.error("Skipping row with missing/empty IDCODE.")
+            continue
+        if image_file is None:
+            logging.error(f"Skipping NFT {idcode} - missing image file.")
+            continue
+        if parent_file is None and not part_files:
+            logging.error(f"Skipping NFT {idcode} - missing molecular data.")
+            continue
+        part_files = [f for f in part_files if file_size(f) > 0]
+        data_file = None if part_files else parent_file
+        if data_file is not None and file_size(data_file) == 0:
+            logging.error(f"Skipping NFT {idcode}, read error on molecular file.")
+            continue
+
+        metadata = [idcode] + [row.get(field, "").strip() for field in METADATA_FIELDS]
+        lengths = [len(v.encode()) for v in metadata] + [file_size(image_file), file_size(data_file) if data_file else 0]
+        parent_job = dict(base, nonce=nonce, gas=estimate_mint_gas(lengths, layout=STORAGE_LAYOUT), metadata=metadata,
+                          image_file=image_file, parent_id=0, idcode=idcode, part=0, token_id=token_id)
+        if data_file is None:
+            parent_job["file_base64"] = ""
+        else:
+            parent_job["data_file"] = data_file
+        yield parent_job
+        parent_token_id = token_id
+        nonce += 1
+        token_id += 1
+
+        for part_file in part_files:
+            part_number = int(re.search(r"_part(\d+)", os.path.basename(part_file)).group(1))
+            yield dict(base, nonce=nonce, gas=estimate_mint_gas([file_size(part_file)], layout=STORAGE_LAYOUT),
+                       metadata=[""] * 9,
+                       data_file=part_file, parent_id=parent_token_id, idcode=idcode, part=part_number,
+                       token_id=child_id)
+            nonce += 1
+            child_id += 1
+
+def cmd_sign(args):
+    from eth_account import Account
+    from eth_utils import to_checksum_address
+    from mol_bundle import BundleWriter
+
+    global CONTRACT_ADDRESS, FIRST_OWNER, STORAGE_LAYOUT
+    CONTRACT_ADDRESS = to_checksum_address(CONTRACT_ADDRESS)
+    FIRST_OWNER = to_checksum_address(FIRST_OWNER)
+    STORAGE_LAYOUT = args.layout
+    account = Account.from_key(PRIVATE_KEY)
+
+    rows = read_csv_data(METADATA_CSV)
+    jobs = list(bundle_jobs(rows, args.nonce, args.first_token_id, args.first_child_id))
+    if not jobs:
+        logging.error("Nothing to sign.")
+        return 1
+    logging.info(f"Signing {len(jobs)} transactions, nonces {args.nonce}..{args.nonce + len(jobs) - 1}.")
+
+    header = {
+        "version": 1,
+        "chain_id": CHAIN_ID,
+        "contract": CONTRACT_ADDRESS,
+        "from": account.address,
+        "owner": FIRST_OWNER,
+        "gas_price": GAS_PRICE,
+        "first_nonce": args.nonce,
+        "first_token_id": args.first_token_id,
+        "first_child_id": args.first_child_id,
+        "csv": os.path.basename(METADATA_CSV),
+    }
+    budget = ByteBudget(args.max_rss)
+    with SigningPool(PRIVATE_KEY, args.workers, budget) as pool, BundleWriter(args.out, header) as bundle:
+        for signed in pool.sign(jobs):
+            record = {
+                "nonce": signed["nonce"],
+                "idcode": signed["idcode"],
+                "part": signed["part"],
+                "token_id": signed["token_id"],
+                "parent_id": signed["parent_id"],
+                "tx_hash": "0x" + signed["tx_hash"].hex(),
+            }
+            bundle.add(record, signed["raw_transaction"])
+            if bundle.count % 1000 == 0:
+                logging.info(f"Signed {bundle.count}/{len(jobs)} transactions.")
+
+    logging.info(f"Wrote {bundle.count} signed transactions to {args.out}.")
+    budget.log_report()
+    if bundle.count < len(jobs):
+        logging.error(f"Bundle stops at nonce {args.nonce + bundle.count - 1}; "
+                      f"{len(jobs) - bundle.count} transactions were not signed.")
+        return 1
+    return 0
+
+def cmd_broadcast(args):
+    from mol_abi import load_abi
+    from mol_bundle import read_bundle
+    from mol_broadcast import Broadcaster, Journal
+
+    header, records = read_bundle(args.bundle)
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    contract = None
+    if not args.skip_token_check:
+        contract = web3.eth.contract(address=header["contract"], abi=load_abi())
+
+    journal = Journal(args.journal or f"{args.bundle}.journal")
+    logging.info(f"Broadcasting {args.bundle} from {header['from']} "
+                 f"(first nonce {header['first_nonce']}) to {header['contract']}.")
+    try:
+        broadcaster = Broadcaster(web3, header, journal, rate=args.rate, window=args.window,
+                                  poll_interval=args.poll_interval, timeout=args.timeout, contract=contract)
+        report = broadcaster.run(records)
+    finally:
+        journal.close()
+
+    logging.info(f"Broadcast report: {report}")
+    if report["stop_reason"]:
+        logging.error(f"Broadcast stopped early: {report['stop_reason']}. "
+                      f"Last confirmed nonce: {report['last_confirmed_nonce']}. Journal: {journal.path}")
+        return 1
+    return 0
+
+def make_reader(web3, args, address=None):
+    from web3 import Web3
+    from mol_reader import ContractReader
+
+    multicall = args.multicall or MULTICALL_ADDRESS
+    if multicall:
+        multicall = Web3.to_checksum_address(multicall)
+    return ContractReader(web3, address or Web3.to_checksum_address(CONTRACT_ADDRESS), multicall=multicall)
+
+def cmd_verify(args):
+    import json
+    from mol_verify import parse_token_spec, verify_tokens
+
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    reader = make_reader(web3, args)
+    if args.tokens:
+        token_ids = parse_token_spec(args.tokens)
+    else:
+        token_ids = list(range(1, reader.call("nextNFTId")))
+    logging.info(f"Verifying {len(token_ids)} parent tokens with {args.workers} workers.")
+
+    counts = {}
+    report = open(args.report, "w") if args.report else None
+    try:
+        for result in verify_tokens(reader, token_ids, get_molecular_files_for_idcode,
+                                    read_file_contents, workers=args.workers):
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            if report:
+                report.write(json.dumps(result) + "\n")
+            if result["status"] == "ok":
+                continue
+            label = f"Token {result['token_id']} ({result.get('idcode')})"
+            if result["status"] == "error":
+                logging.error(f"{label}: read error: {result['error']}")
+            elif result["status"] == "no_local":
+                logging.warning(f"{label}: no local molecular data.")
+            else:
+                logging.error(
+                    f"{label}: {len(result['missing'])} missing, {len(result['extra'])} extra, "
+                    f"{len(result['out_of_order'])} out of order, {len(result['failed_reads'])} unreadable; "
+                    f"chunks local/chain {result['chunks_local']}/{result['chunks_chain']}; "
+                    f"whole file {'matches' if result['sha256_local'] == result['sha256_chain'] else 'differs'}."
+                )
+    finally:
+        if report:
+            report.close()
+    logging.info(f"Verification summary: {counts}")
+    return 0 if set(counts) <= {"ok"} else 1
+
+def sync_function(contract, action, parent_token_id):
+    empty = [""] * 9
+    if action.kind == "update_parent":
+        return contract.functions.updateMetadata(action.token_id, *action.fields)
+    if action.kind == "blank_child":
+        return contract.functions.updateMetadata(action.token_id, *empty, "", "")
+    part_data = read_file_contents(action.part_file)
+    if not part_data:
+        raise ValueError(f"read error on {action.part_file}")
+    if action.kind == "update_child":
+        return contract.functions.updateMetadata(action.token_id, *empty, "", part_data)
+    return contract.functions.mintNFT(FIRST_OWNER, *empty, "", part_data, parent_token_id)
+
+def cmd_sync(args):
+    global CONFIRMER
+    from mol_sync import plan_sync
+    from mol_verify import parse_token_spec
+
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    contract = load_contract(web3)
+    reader = make_reader(web3, args, contract.address)
+    rows = {(row.get("IDCODE") or "").strip().upper(): row for row in read_csv_data(METADATA_CSV)}
+    token_ids = parse_token_spec(args.tokens) if args.tokens else list(range(1, reader.call("nextNFTId")))
+
+    account = None
+    if not args.dry_run:
+        account = web3.eth.account.from_key(PRIVATE_KEY)
+        nonces = NonceManager(web3, account, CHAIN_ID, GAS_PRICE, args.fill_gaps)
+        CONFIRMER = BlockConfirmer(web3, raw=False)
+        CONFIRMER.start()
+
+    planned = 0
+    failures = 0
+    for token_id in token_ids:
+        try:
+            idcode = reader.call("getMetadata", token_id)[0]
+            row = rows.get(idcode.upper())
+            if row is None:
+                logging.info(f"Token {token_id} ({idcode}) is not in the CSV; skipping.")
+                continue
+            parent_file, part_files = get_molecular_files_for_idcode(idcode)
+            if parent_file is None and not part_files:
+                logging.error(f"Token {token_id} ({idcode}): no local molecular data; skipping.")
+                continue
+            image_data = get_image_for_idcode(idcode)
+            idcode, actions = plan_sync(reader, token_id, row, image_data, parent_file, part_files,
+                                        read_file_contents)
+        except Exception as e:
+            logging.error(f"Token {token_id}: could not plan sync: {e}")
+            failures += 1
+            continue
+
+        if not actions:
+            logging.info(f"Token {token_id} ({idcode}) is up to date.")
+            continue
+        planned += len(actions)
+        logging.info(f"Token {token_id} ({idcode}): {len(actions)} transaction(s): {actions}")
+        if args.dry_run:
+            continue
+
+        for action in actions:
+            try:
+                func = sync_function(contract, action, token_id)
+                receipt = mint_transaction(web3, func, account, nonces)
+                if receipt.status != 1:
+                    raise RuntimeError(f"transaction {receipt.transactionHash.hex()} reverted")
+            except Exception as e:
+                logging.error(f"Token {token_id} ({idcode}): {action} failed: {e}")
+                failures += 1
+                # Appends after a failure would land at the wrong child index.
+                break
+
+    if not args.dry_run:
+        nonces.log_stats()
+    logging.info(f"Sync {'planned' if args.dry_run else 'sent'} {planned} transaction(s); {failures} failure(s).")
+    return 1 if failures else 0
+
+def cmd_gateway(args):
+    from mol_gateway import serve
+
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    reader = make_reader(web3, args)
+    serve(reader, args.host, args.port, args.cache_dir, args.cache_size, args.ttl, args.workers)
+    return 0
+
+def cmd_export(args):
+    from mol_export import export
+
+    if importlib.util.find_spec("pyarrow") is None:
+        logging.error("The export command needs pyarrow: pip install pyarrow")
+        return 1
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    reader = make_reader(web3, args)
+    path, rows, error = export(reader, args.out, args.format, args.with_payloads, args.workers, args.batch)
+    if path is None and error is None:
+        logging.info(f"{args.out} is up to date.")
+    elif path is not None:
+        logging.info(f"Wrote {rows} tokens to {path}.")
+    if error is not None:
+        logging.error(f"Export stopped at a token that could not be read: {error}")
+        return 1
+    return 0
+
+def open_sequence_index(args):
+    from web3 import Web3
+    from mol_seqindex import SequenceIndex, index_path
+
+    return SequenceIndex(args.index or index_path(Web3.to_checksum_address(CONTRACT_ADDRESS)))
+
+def cmd_seq_index(args):
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
+    reader = make_reader(web3, args)
+    index = open_sequence_index(args)
+    try:
+        added = index.rebuild(reader) if args.rebuild else index.update(reader)
+    except Exception as e:
+        logging.error(f"Sequence index update stopped at token {index.last_token + 1}: {e}")
+        return 1
+    finally:
+        logging.info(f"Sequence index: {index.count()} tokens, up to token {index.last_token}.")
+        index.close()
+    logging.info(f"Indexed {added} new tokens.")
+    return 0
+
+def cmd_seq_search(args):
+    import time
+
+    if args.update and cmd_seq_index(argparse.Namespace(index=args.index, multicall=None, rebuild=False)):
+        return 1
+    index = open_sequence_index(args)
+    try:
+        started = time.time()
+        if args.similar:
+            results = index.similar(args.query, args.top)
+            for token_id, idcode, score in results:
+                print(f"{token_id:>10} {idcode:<8} {score:.3f}")
+        else:
+            results = index.substring(args.query, args.top)
+            for token_id, idcode, positions in results:
+                print(f"{token_id:>10} {idcode:<8} {','.join(str(p) for p in positions)}")
+        logging.info(f"{len(results)} result(s) from {index.count()} indexed tokens "
+                     f"in {(time.time() - started) * 1000:.1f} ms.")
+    finally:
+        index.close()
+    return 0
+
+def chain_block_params(web3, sample=100):
+    latest = web3.eth.get_block("latest")
+    earlier = web3.eth.get_block(max(0, latest["number"] - sample))
+    blocks = latest["number"] - earlier["number"]
+    block_time = (latest["timestamp"] - earlier["timestamp"]) / blocks if blocks else None
+    return latest["gasLimit"], block_time
+
+def recompress_structures(structures, codecs, workers):
+    """
+    (codec, fileBase64 text) for each structure in order, re-compressed with
+    whichever of 'codecs' gives the fewest base64 characters.
+    """
+    from multiprocessing import Pool
+    from mol_codec import recompress_base64
+
+    codecs = None if codecs == "auto" else codecs
+    jobs = (("".join(read_file_contents(f) or "" for f in (part_files or [parent_file])), codecs)
+            for _, _, _, parent_file, part_files in structures)
+    with Pool(max(1, min(workers, len(structures)))) as pool:
+        for (idcode, *_), (codec, text, error) in zip(structures, pool.imap(recompress_base64, jobs)):
+            if error is not None:
+                logging.error(f"{idcode}: could not re-compress, keeping the original data: {error}")
+                codec = "-"
+            yield codec, text
+
+def cmd_chunks(args):
+    from mol_chunking import optimize, current_plan, write_chunks, fits
+
+    block_gas_limit, block_time = args.block_gas_limit, args.block_time
+    if block_gas_limit is None:
+        web3 = connect_web3()
+        if web3 is None:
+            return 1
+        block_gas_limit, measured = chain_block_params(web3)
+        block_time = block_time or measured
+    logging.info(f"Block gas limit {block_gas_limit}, fill {args.fill}, max tx bytes {args.max_tx_bytes}"
+                 + (f", block time {block_time:.2f}s." if block_time else "."))
+
+    rows = read_csv_data(METADATA_CSV)
+    structures = [s for s in iter_structures(rows) if s[0] is not None and (s[3] is not None or s[4])]
+    recompressed = recompress_structures(structures, args.recompress, args.workers) if args.recompress else None
+    report = []
+    totals = {"current_gas": 0, "optimal_gas": 0, "current_txs": 0, "optimal_txs": 0}
+    layout_gas = {layout: 0 for layout in LAYOUTS}
+    for idcode, row, image_file, parent_file, part_files in structures:
+        codec, data = next(recompressed) if recompressed is not None else ("-", None)
+        metadata = [idcode] + [row.get(field, "").strip() for field in METADATA_FIELDS]
+        parent_lengths = [len(v.encode()) for v in metadata] + [file_size(image_file) if image_file else 0]
+        part_lengths = [file_size(f) for f in part_files]
+        if part_lengths:
+            current = current_plan(part_lengths, parent_lengths, block_gas_limit, args.fill, block_time, args.layout)
+            total_length = sum(part_lengths)
+        else:
+            total_length = file_size(parent_file)
+            current = current_plan([], parent_lengths + [total_length], block_gas_limit, args.fill, block_time,
+                                   args.layout)
+        if data is not None:
+            total_length = len(data)
+
+        # The optimal plan under every storage layout, for the comparison
+        plans = {layout: optimize(total_length, parent_lengths, block_gas_limit, args.fill, args.max_tx_bytes,
+                                  block_time, layout) for layout in LAYOUTS}
+        best = plans[args.layout]
+        if best is None:
+            if not fits(parent_lengths, block_gas_limit, args.fill, args.max_tx_bytes, layout=args.layout):
+                logging.error(f"{idcode}: the parent mint (metadata + image) alone does not fit a block "
+                              f"with gas limit {block_gas_limit}.")
+            else:
+                logging.error(f"{idcode}: no chunk size fits a block with gas limit {block_gas_limit}.")
+            continue
+        saved = 100.0 * (current["gas"] - best["gas"]) / current["gas"] if current["gas"] else 0.0
+        report.append({
+            "IDCODE": idcode,
+            "CODEC": codec,
+            "BYTES": total_length,
+            "CUR_PARTS": current["parts"], "CUR_CHUNK": current["chunk_size"],
+            "CUR_GAS": current["gas"], "CUR_BLOCKS": current["blocks"], "CUR_FITS": int(current["fits"]),
+            "OPT_PARTS": best["parts"], "OPT_CHUNK": best["chunk_size"],
+            "OPT_GAS": best["gas"], "OPT_BLOCKS": best["blocks"],
+            "GAS_SAVED_PCT": f"{saved:.1f}",
+            **{f"{layout.upper()}_GAS": plan["gas"] if plan else "-" for layout, plan in plans.items()},
+        })
+        totals["current_gas"] += current["gas"]
+        totals["optimal_gas"] += best["gas"]
+        totals["current_txs"] += current["txs"]
+        totals["optimal_txs"] += best["txs"]
+        if all(plans.values()):
+            for layout, plan in plans.items():
+                layout_gas[layout] += plan["gas"]
+
+        if args.out:
+            if data is None:
+                data = "".join(read_file_contents(f) or "" for f in (part_files or [parent_file]))
+            write_chunks(data, best["chunk_size"], args.out, idcode)
+
+    columns = ["IDCODE", "CODEC", "BYTES", "CUR_PARTS", "CUR_CHUNK", "CUR_GAS", "CUR_FITS",
+               "OPT_PARTS", "OPT_CHUNK", "OPT_GAS", "GAS_SAVED_PCT"] + [f"{layout.upper()}_GAS" for layout in LAYOUTS]
+    print(" ".join(f"{c:>13}" for c in columns))
+    for entry in report:
+        print(" ".join(f"{str(entry[c]):>13}" for c in columns))
+    if totals["current_gas"]:
+        saved = 100.0 * (totals["current_gas"] - totals["optimal_gas"]) / totals["current_gas"]
+        print(f"Total: {totals['current_txs']} -> {totals['optimal_txs']} transactions, "
+              f"{totals['current_gas']} -> {totals['optimal_gas']} gas ({saved:.1f}% saved).")
+    if layout_gas["slots"] and layout_gas["sstore2"]:
+        print(f"Storage layouts, each chunked optimally (modelled by estimate_mint_gas, not measured): "
+              f"slots ~{layout_gas['slots']} gas, sstore2 ~{layout_gas['sstore2']} gas "
+              f"({layout_gas['slots'] / layout_gas['sstore2']:.2f}x less).")
+    if args.report:
+        with open(args.report, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(report[0]) if report else columns)
+            writer.writeheader()
+            writer.writerows(report)
+    if args.out:
+        logging.info(f"Re-chunked files written to {args.out}.")
+    return 0
+
+def cmd_mint(args):
+    global PROFILER, LOCAL_ARTIFACT
+    if args.backend == "local":
+        from mol_local import artifact_path
+        LOCAL_ARTIFACT = args.artifact or artifact_path(args.variant)
+    if args.profile:
+        PROFILER = StageProfiler(args.profile, args.profile_sample, args.profile_memory)
+    try:
+        return run_campaign(args.workers, ByteBudget(args.max_rss) if args.max_rss else None, args.fill_gaps)
+    finally:
+        PROFILER.close()
+
+def parse_args(argv=None):
+    paths = argparse.ArgumentParser(add_help=False)
+    paths.add_argument("--csv", help=f"Metadata CSV. Default: {METADATA_CSV}")
+    paths.add_argument("--images-dir", help=f"Directory of *.base64.txt images. Default: {IMAGES_DIR}")
+    paths.add_argument("--molecular-dir", help=f"Directory of *.bcif.gz.base64 files. Default: {MOLECULAR_DIR}")
+
+    reads = argparse.ArgumentParser(add_help=False)
+    reads.add_argument("--multicall", metavar="ADDRESS",
+                       help="Multicall3 aggregator to pack view calls into (e.g. "
+                            "0xcA11bde05977b3631167028862bE2a173976CA11). Default: JSON-RPC batches only")
+
+    images = argparse.ArgumentParser(add_help=False)
+    images.add_argument("--image-size", type=int, default=230, metavar="PX",
+                        help="Renders without a *.base64.txt thumbnail are fitted into PX x PX. Default: 230")
+    images.add_argument("--image-max-bytes", type=int, default=32_768, metavar="N",
+                        help="Largest imageBase64 payload for a prepared render. Default: 32768")
+    images.add_argument("--image-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to prepare renders. Default: all cores")
+
+    parser = argparse.ArgumentParser(description="Mint MolNFT tokens from a metadata CSV and molecular data files.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    mint = commands.add_parser("mint", parents=[paths, images], help="Mint every structure in the CSV (default).")
+    mint.add_argument("--profile", metavar="DIR",
+                      help="Write per-stage cProfile output and timings for each IDCODE into DIR.")
+    mint.add_argument("--profile-sample", type=float, default=1.0, metavar="RATE",
+                      help="Fraction of IDCODEs to run under cProfile (0..1). Timings are always recorded. Default: 1.0")
+    mint.add_argument("--profile-memory", action="store_true",
+                      help="Also trace allocations with tracemalloc for sampled IDCODEs.")
+    mint.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                      help="Processes used to encode and sign child transactions; 1 signs on the main thread. "
+                           "Default: all cores")
+    mint.add_argument("--max-rss", type=parse_size, metavar="SIZE",
+                      help="Cap the transaction payloads held in flight (reading, signing, awaiting broadcast), "
+                           "e.g. 2G. Default: no cap")
+    mint.add_argument("--fill-gaps", action="store_true",
+                      help="Fill nonce gaps left by dropped transactions with no-op self-transfers "
+                           "instead of only reporting them.")
+    mint.add_argument("--backend", choices=["rpc", "local"], default="rpc",
+                      help="rpc sends to RPC_URL; local deploys the contract into an in-process chain "
+                           "(eth-tester) and mints there. Default: rpc")
+    mint.add_argument("--variant", choices=["molnft", "editor", "batch", "sstore2"], default="batch",
+                      help="Contract deployed by --backend local: molnft.sol, molnft_editor_version.sol, "
+                           "molnft_editor_version_batch.sol or molnft_editor_version_sstore2.sol. Default: batch")
+    mint.add_argument("--artifact", metavar="JSON",
+                      help="Compiled contract (solc --combined-json, Hardhat or Foundry) for --backend local. "
+                           "Default: artifacts/<variant file>.json")
+    mint.set_defaults(func=cmd_mint)
+
+    plan = commands.add_parser("plan", parents=[paths, images], help="List transactions and payload sizes without a node.")
+    plan.set_defaults(func=cmd_plan)
+
+    validate = commands.add_parser("validate", parents=[paths, images], help="Check the CSV and input files without a node.")
+    validate.set_defaults(func=cmd_validate)
+
+    sign = commands.add_parser("sign", parents=[paths, images],
+                               help="Sign every mint transaction offline into a bundle for `broadcast`.")
+    sign.add_argument("--out", required=True, help="Bundle file to write.")
+    sign.add_argument("--nonce", type=int, required=True, help="Nonce of the first transaction.")
+    sign.add_argument("--first-token-id", type=int, required=True,
+                      help="The contract's nextNFTId when the bundle will be broadcast.")
+    sign.add_argument("--first-child-id", type=int, required=True,
+                      help="The contract's nextChildId when the bundle will be broadcast.")
+    sign.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                      help="Signing processes. Default: all cores")
+    sign.add_argument("--max-rss", type=parse_size, metavar="SIZE",
+                      help="Cap the transaction payloads held in flight, e.g. 2G. Default: no cap")
+    sign.add_argument("--layout", choices=LAYOUTS, default="slots",
+                      help="How the contract stores fileBase64, for the gas limits: slots, or sstore2 for "
+                           "molnft_editor_version_sstore2.sol. Default: slots")
+    sign.set_defaults(func=cmd_sign)
+
+    broadcast = commands.add_parser("broadcast", help="Push a signed bundle to the node.")
+    broadcast.add_argument("bundle", help="Bundle written by `sign`.")
+    broadcast.add_argument("--journal", help="Journal file. Default: <bundle>.journal")
+    broadcast.add_argument("--rate", type=float, default=0.0, help="Max transactions per second; 0 = unlimited.")
+    broadcast.add_argument("--window", type=int, default=64, help="Max unconfirmed transactions in flight. Default: 64")
+    broadcast.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between receipt polls.")
+    broadcast.add_argument("--timeout", type=float, default=600, help="Seconds to wait for a receipt before stopping.")
+    broadcast.add_argument("--skip-token-check", action="store_true",
+                           help="Do not compare nextNFTId/nextChildId with the bundle's predicted tokenIds.")
+    broadcast.set_defaults(func=cmd_broadcast)
+
+    verify = commands.add_parser("verify", parents=[paths, reads],
+                                 help="Compare on-chain chunks with the local files by SHA-256.")
+    verify.add_argument("--tokens", help="Parent tokenIds, e.g. 1-500,730. Default: every parent token.")
+    verify.add_argument("--workers", type=int, default=8, help="Tokens verified concurrently. Default: 8")
+    verify.add_argument("--report", help="Write one JSON result per token to this file.")
+    verify.set_defaults(func=cmd_verify)
+
+    sync = commands.add_parser("sync", parents=[paths, images, reads],
+                               help="Re-upload only the chunks and metadata that differ from the local files.")
+    sync.add_argument("--tokens", help="Parent tokenIds, e.g. 1-500,730. Default: every parent token.")
+    sync.add_argument("--dry-run", action="store_true", help="Only report the transactions that would be sent.")
+    sync.add_argument("--fill-gaps", action="store_true",
+                      help="Fill nonce gaps left by dropped transactions with no-op self-transfers.")
+    sync.set_defaults(func=cmd_sync)
+
+    chunks = commands.add_parser("chunks", parents=[paths],
+                                 help="Find the gas-optimal chunk size per structure and optionally re-chunk.")
+    chunks.add_argument("--block-gas-limit", type=int,
+                        help="Block gas limit to plan for. Default: read from the latest block.")
+    chunks.add_argument("--block-time", type=float, help="Seconds per block. Default: measured on chain.")
+    chunks.add_argument("--fill", type=float, default=0.9, help="Share of a block one tx may use. Default: 0.9")
+    chunks.add_argument("--max-tx-bytes", type=int, default=1_048_576,
+                        help="Largest raw transaction the node accepts. Default: 1048576")
+    chunks.add_argument("--out", help="Write re-chunked *.bcif.gz.base64[_partN] files into this directory.")
+    chunks.add_argument("--report", help="Write the comparison as CSV.")
+    chunks.add_argument("--recompress", nargs="?", const="auto", type=parse_codecs, metavar="CODECS",
+                        help="Re-compress each structure with the smallest of xz, zstd and brotli "
+                             "(or the comma-separated CODECS) before chunking.")
+    chunks.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used by --recompress. Default: all cores")
+    chunks.add_argument("--layout", choices=LAYOUTS, default="slots",
+                        help="How the target contract stores fileBase64: slots, or sstore2 for "
+                             "molnft_editor_version_sstore2.sol. The plan is made for this layout; "
+                             "the other is reported for comparison. Both figures come from the "
+                             "offline gas model, not from executing the contracts. Default: slots")
+    chunks.set_defaults(func=cmd_chunks)
+
+    gateway = commands.add_parser("gateway", parents=[reads],
+                                  help="Serve /token/<id>.bcif and /token/<id>/metadata.json from a local cache.")
+    gateway.add_argument("--host", default="127.0.0.1", help="Address to listen on. Default: 127.0.0.1")
+    gateway.add_argument("--port", type=int, default=8080, help="Port to listen on. Default: 8080")
+    gateway.add_argument("--cache-dir", help="Cache directory. Default: ~/.cache/molnft/gateway")
+    gateway.add_argument("--cache-size", type=parse_size, default="2G", metavar="SIZE",
+                         help="Largest total size of cached tokens. Default: 2G")
+    gateway.add_argument("--ttl", type=int, default=3600,
+                         help="Seconds before a cached token is read from the chain again. Default: 3600")
+    gateway.add_argument("--workers", type=int, default=8,
+                         help="Concurrent getMetadata batches per token. Default: 8")
+    gateway.set_defaults(func=cmd_gateway)
+
+    export = commands.add_parser("export", parents=[reads], help="Export parent token metadata to Parquet or Arrow files.")
+    export.add_argument("--out", required=True,
+                        help="Output directory; new tokens are appended as another part file on each run.")
+    export.add_argument("--format", choices=["parquet", "arrow"], default="parquet", help="Default: parquet")
+    export.add_argument("--with-payloads", action="store_true", help="Also export imageBase64 and fileBase64.")
+    export.add_argument("--workers", type=int, default=8, help="Concurrent token batches. Default: 8")
+    export.add_argument("--batch", type=int, default=100, help="Tokens per JSON-RPC batch. Default: 100")
+    export.set_defaults(func=cmd_export)
+
+    seq_index = commands.add_parser("seq-index", parents=[reads],
+                                    help="Add newly minted SEQUENCE fields to the local k-mer index.")
+    seq_index.add_argument("--index", help="Index file. Default: ~/.cache/molnft/seqindex/<contract>.sqlite")
+    seq_index.add_argument("--rebuild", action="store_true",
+                           help="Re-read every token (picks up sequences changed with updateMetadata).")
+    seq_index.set_defaults(func=cmd_seq_index)
+
+    seq_search = commands.add_parser("seq-search", help="Search the local SEQUENCE index.")
+    seq_search.add_argument("query", help="Residues to look for; case and whitespace are ignored.")
+    seq_search.add_argument("--similar", action="store_true",
+                            help="Rank tokens by shared 5-mers instead of requiring an exact substring.")
+    seq_search.add_argument("--top", type=int, default=20, help="Maximum results. Default: 20")
+    seq_search.add_argument("--index", help="Index file. Default: ~/.cache/molnft/seqindex/<contract>.sqlite")
+    seq_search.add_argument("--update", action="store_true", help="Index newly minted tokens first.")
+    seq_search.set_defaults(func=cmd_seq_search)
+
+    abi = commands.add_parser("abi", help="Show function selectors and event topics, or look one up.")
+    abi.add_argument("key", nargs="?", help="Selector, topic, name or signature to look up.")
+    abi.set_defaults(func=cmd_abi)
+
+    argv = list(argv if argv is not None else sys.argv[1:])
+    if not argv or (argv[0] not in commands.choices and argv[0] not in ("-h", "--help")):
+        # Plain `mol_mint.py` and the flag-only calls from before the
+        # subcommands (`mol_mint.py --profile DIR`) keep minting.
+        argv = ["mint"] + argv
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if hasattr(args, "csv"):
+        configure_paths(args)
+    if hasattr(args, "image_size"):
+        prepare_source_images(args)
+    return args.func(args)
+
+def run_campaign(workers=1, budget=None, fill_gaps=False):
+    """
+    Mint every CSV row. Returns the exit status: 1 if the node could not be
+    reached or any mint failed.
+    """
+    global CONFIRMER, BUDGET
+
+    web3 = connect_web3()
+    if web3 is None:
+        return 1
 
     contract = load_contract(web3)
     account  = web3.eth.account.from_key(PRIVATE_KEY)
     logging.info(f"Using account: {account.address}")
 
-    nonce = web3.eth.get_transaction_count(account.address)
+    nonces = NonceManager(web3, account, CHAIN_ID, GAS_PRICE, fill_gaps)
+    nonces.sync()
 
+    CONFIRMER = BlockConfirmer(web3, raw=False)
+    CONFIRMER.start()
+    BUDGET = budget or ByteBudget()
+    pool = SigningPool(PRIVATE_KEY, workers, BUDGET) if workers > 1 else None
+    try:
+        failed = run_rows(web3, contract, account, nonces, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+        BUDGET.log_report()
+        CONFIRMER.log_stats()
+        nonces.log_stats()
+    if failed:
+        logging.error(f"{failed} mint(s) failed or were skipped; see the errors above.")
+        return 1
+    return 0
+
+def run_rows(web3, contract, account, nonces, pool=None):
+    """
+    Returns the number of mints that failed or were skipped.
+    """
     # Read CSV
     try:
         rows = read_csv_data(METADATA_CSV)
     except Exception as e:
         logging.error(f"Error reading CSV: {e}")
-        return
+        return 1
     logging.info(f"Found {len(rows)} rows in CSV.")
 
+    failed = 0
     for row in rows:
         idcode_raw = row.get("IDCODE")
         if not idcode_raw or not idcode_raw.strip():
             logging.error("Skipping row with missing/empty IDCODE.")
+            failed += 1
             continue
 
         idcode = idcode_raw.strip()
         logging.info(f"Processing NFT with IDCODE: {idcode}")
+        PROFILER.begin(idcode)
 
         image_data = get_image_for_idcode(idcode)
         if image_data is None:
             logging.error(f"Skipping NFT {idcode} - missing image file.")
+            failed += 1
             continue
 
         parent_file, part_files = get_molecular_files_for_idcode(idcode)
         if (parent_file is None) and not part_files:
             logging.error(f"Skipping NFT {idcode} - missing molecular data.")
+            failed += 1
             continue
 
         # Additional CSV fields
@@ -1818,10 +1218,10 @@ def main():
                     "",
                     0
                 )
-                receipt = mint_transaction(web3, parent_func, account, nonce)
-                nonce += 1
+                receipt = mint_transaction(web3, parent_func, account, nonces)
             except Exception as e:
                 logging.error(f"Error minting parent NFT {idcode}: {e}")
+                failed += 1
                 continue
 
             # 2) read event
@@ -1833,9 +1233,11 @@ def main():
                     logging.info(f"Parent minted tokenId: {parent_token_id}")
                 else:
                     logging.error("No ParentNFTMinted event found in receipt.")
+                    failed += 1
                     continue
             except Exception as e:
                 logging.error(f"Error reading event for parent NFT {idcode}: {e}")
+                failed += 1
                 continue
 
             # 3) children
@@ -1847,10 +1249,16 @@ def main():
                     sorted_parts.append((int(m.group(1)), f))
             sorted_parts.sort(key=lambda x: x[0])
 
+            if pool is not None:
+                failed += mint_children_parallel(web3, contract, account, pool, nonces,
+                                                 idcode, parent_token_id, sorted_parts)
+                continue
+
             for part_number, part_file in sorted_parts:
                 part_data = read_file_contents(part_file)
                 if not part_data:
                     logging.error(f"Skipping child NFT {idcode} part {part_number}, read error.")
+                    failed += 1
                     continue
                 try:
                     child_func = contract.functions.mintNFT(
@@ -1860,11 +1268,15 @@ def main():
                         part_data,
                         parent_token_id
                     )
-                    receipt = mint_transaction(web3, child_func, account, nonce)
-                    nonce += 1
+                    receipt = mint_transaction(web3, child_func, account, nonces)
+                    if receipt.status != 1:
+                        logging.error(f"Child NFT for {idcode} part {part_number} reverted.")
+                        failed += 1
+                        continue
                     logging.info(f"Child NFT for {idcode} part {part_number} minted OK.")
                 except Exception as e:
                     logging.error(f"Error minting child NFT for {idcode} part {part_number}: {e}")
+                    failed += 1
                     continue
 
         else:
@@ -1873,6 +1285,7 @@ def main():
             file_data = read_file_contents(parent_file)
             if not file_data:
                 logging.error(f"Skipping NFT {idcode}, read error on molecular file.")
+                failed += 1
                 continue
             try:
                 standard_func = contract.functions.mintNFT(
@@ -1890,12 +1303,18 @@ def main():
                     file_data,
                     0
                 )
-                receipt = mint_transaction(web3, standard_func, account, nonce)
-                nonce += 1
+                receipt = mint_transaction(web3, standard_func, account, nonces)
+                if receipt.status != 1:
+                    logging.error(f"NFT {idcode} reverted.")
+                    failed += 1
+                    continue
                 logging.info(f"NFT {idcode} minted successfully.")
             except Exception as e:
                 logging.error(f"Error minting NFT for {idcode}: {e}")
+                failed += 1
                 continue
 
+    return failed
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+import logging
+
+from mol_rpc import rpc_call, hex_to_int
+
+# --------------------------- BULK VIEW CALLS ---------------------------
+# Sends many eth_calls in few HTTP round trips, in one of two ways:
+#
+#   JSON-RPC batch   one eth_call per view call, many per HTTP request
+#   Multicall3       view calls packed into aggregate3() (allowFailure on
+#                    every call) on an aggregator deployed on the chain, so
+#                    the node runs one EVM call per group; groups are then
+#                    sent as a JSON-RPC batch as well
+#
+# Both are sized on the fly. Calls per request are capped so the expected
+# response (bytes per call, averaged over what came back so far) stays under
+# max_bytes, and halved whenever the node rejects a request (body or
+# response limit, timeout). Calls per aggregate3 group are derived from the
+# gas of one call of the same function measured with eth_estimateGas, so a
+# group stays under the node's eth_call gas cap, and halved on out-of-gas.
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"  # same address on most EVM chains
+AGGREGATE3         = "aggregate3((address,bool,bytes)[])"
+ETH_CALL_GAS_CAP   = 25_000_000       # Cosmos SDK EVM default (evm-rpc gas cap)
+GAS_FILL           = 0.7              # share of the cap one group may use; calls of one function vary
+MAX_CALLS          = 1000             # calls per HTTP request
+MAX_RESPONSE_BYTES = 8 * 1024 ** 2    # bytes of eth_call results per HTTP request
+GROW_AFTER         = 4                # successful requests before the size grows again
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+
+class RequestFailed(Exception):
+    pass
+
+def _selector(signature):
+    from eth_utils import keccak
+
+    return keccak(text=signature)[:4]
+
+def revert_reason(data):
+    from eth_abi import decode
+
+    if data[:4] == ERROR_SELECTOR:
+        try:
+            return decode(["string"], data[4:])[0]
+        except Exception:
+            pass
+    return "0x" + data.hex()
+
+def encode_aggregate3(calls):
+    """
+    [(target, calldata bytes), ...] -> aggregate3 calldata, every call with
+    allowFailure=true.
+    """
+    from eth_abi import encode
+
+    return _selector(AGGREGATE3) + encode(["(address,bool,bytes)[]"], [[(t, True, d) for t, d in calls]])
+
+def decode_aggregate3(result):
+    """
+    aggregate3 return data (hex) -> [(success, return data bytes), ...]
+    """
+    from eth_abi import decode
+
+    return decode(["(bool,bytes)[]"], bytes.fromhex(result[2:]))[0]
+
+def is_gas_error(error):
+    text = str(error).lower()
+    return "gas" in text and ("out of" in text or "exceed" in text or "cap" in text or "limit" in text)
+
+class AdaptiveSize:
+    """
+    Batch size that halves on failure and grows by a quarter after
+    GROW_AFTER successes in a row, between 1 and 'maximum'.
+    """
+    def __init__(self, initial, maximum):
+        self.maximum = maximum
+        self.value = max(1, min(initial, maximum))
+        self.successes = 0
+
+    def shrink(self, tried):
+        self.value = max(1, min(self.value, tried) // 2)
+        self.successes = 0
+
+    def success(self):
+        self.successes += 1
+        if self.successes >= GROW_AFTER:
+            self.value = min(self.maximum, self.value + max(1, self.value // 4))
+            self.successes = 0
+
+class CallBatcher:
+    def __init__(self, web3, multicall=None, block="latest", max_calls=MAX_CALLS,
+                 max_bytes=MAX_RESPONSE_BYTES, gas_cap=ETH_CALL_GAS_CAP):
+        self.web3 = web3
+        self.multicall = multicall
+        self.block = block
+        self.max_bytes = max_bytes
+        self.gas_cap = gas_cap
+        self.size = AdaptiveSize(100, max_calls)
+        self.group_sizes = {}   # function selector -> AdaptiveSize
+        self.bytes_per_call = {}
+        self.batch_supported = hasattr(web3.provider, "make_batch_request")
+        self.checked = multicall is None
+        self.stats = {"requests": 0, "eth_calls": 0, "calls": 0, "splits": 0}
+
+    def _check_multicall(self):
+        self.checked = True
+        code, error = rpc_call(self.web3, "eth_getCode", [self.multicall, self.block])
+        if error is not None or not code or code == "0x":
+            logging.warning(f"No aggregator contract at {self.multicall}; using plain JSON-RPC batches.")
+            self.multicall = None
+
+    def _request(self, calls):
+        """
+        One HTTP request with the given [(method, params), ...]. Raises
+        RequestFailed if the request as a whole was rejected.
+        """
+        self.stats["requests"] += 1
+        self.stats["eth_calls"] += len(calls)
+        try:
+            if len(calls) == 1 or not self.batch_supported:
+                if len(calls) > 1:
+                    return [self._request([c])[0] for c in calls]
+                response = self.web3.provider.make_request(*calls[0])
+                return [(response.get("result"), response.get("error"))]
+            responses = self.web3.provider.make_batch_request(calls)
+        except Exception as e:
+            raise RequestFailed(str(e))
+        if not isinstance(responses, list) or len(responses) != len(calls):
+            error = responses.get("error") if isinstance(responses, dict) else responses
+            if "batch" in str(error).lower():
+                logging.warning("Node rejected a JSON-RPC batch; sending calls one per request.")
+                self.batch_supported = False
+                return self._request(calls)
+            raise RequestFailed(str(error))
+        return [(r.get("result"), r.get("error")) for r in responses]
+
+    def _group_size(self, selector, target, data):
+        size = self.group_sizes.get(selector)
+        if size is None:
+            gas = None
+            result, error = rpc_call(self.web3, "eth_estimateGas",
+                                     [{"to": self.multicall, "data": "0x" + encode_aggregate3([(target, data)]).hex()}])
+            if error is None and result:
+                gas = hex_to_int(result)
+            initial = int(self.gas_cap * GAS_FILL // gas) if gas else 50
+            size = self.group_sizes[selector] = AdaptiveSize(initial, MAX_CALLS)
+        return size
+
+    def _send(self, calls):
+        """
+        [(target, calldata bytes), ...] in one HTTP request -> [(result hex, error)].
+        """
+        if self.multicall is None:
+            params = [("eth_call", [{"to": t, "data": "0x" + d.hex()}, self.block]) for t, d in calls]
+            return self._request(params)
+
+        groups = []
+        start = 0
+        while start < len(calls):
+            size = self._group_size(calls[start][1][:4], *calls[start])
+            groups.append((start, calls[start:start + size.value], size))
+            start += size.value
+        params = [("eth_call", [{"to": self.multicall, "data": "0x" + encode_aggregate3(g).hex()}, self.block])
+                  for _, g, _ in groups]
+        results = []
+        for (_, group, size), (result, error) in zip(groups, self._request(params)):
+            if error is not None and is_gas_error(error) and len(group) > 1:
+                size.shrink(len(group))
+                self.stats["splits"] += 1
+                results.extend(self._send(group))
+                continue
+            if error is not None or not result:
+                results.extend((None, error) for _ in group)
+                continue
+            size.success()
+            for success, data in decode_aggregate3(result):
+                if success:
+                    results.append(("0x" + data.hex(), None))
+                else:
+                    results.append((None, f"execution reverted: {revert_reason(data)}"))
+        return results
+
+    def run(self, calls, max_calls=None):
+        """
+        [(target, calldata bytes), ...] -> [(result hex or None, error), ...]
+        in the same order. 'max_calls' caps the calls per request.
+        """
+        if not self.checked:
+            self._check_multicall()
+        key = calls[0][1][:4] if calls else None
+        out = []
+        i = 0
+        while i < len(calls):
+            n = self.size.value
+            if self.bytes_per_call.get(key):
+                n = min(n, max(1, int(self.max_bytes // self.bytes_per_call[key])))
+            if max_calls:
+                n = min(n, max_calls)
+            chunk = calls[i:i + n]
+            try:
+                results = self._send(chunk)
+            except RequestFailed as e:
+                if len(chunk) == 1:
+                    results = [(None, str(e))]
+                else:
+                    logging.warning(f"Request of {len(chunk)} calls failed ({e}); splitting.")
+                    self.size.shrink(len(chunk))
+                    self.stats["splits"] += 1
+                    continue
+            else:
+                self.size.success()
+            returned = sum(len(r) for r, _ in results if r)
+            average = returned / len(chunk)
+            previous = self.bytes_per_call.get(key)
+            self.bytes_per_call[key] = average if previous is None else 0.5 * previous + 0.5 * average
+            self.stats["calls"] += len(chunk)
+            out.extend(results)
+            i += len(chunk)
+        return out
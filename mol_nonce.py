@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+import re
+import logging
+
+# --------------------------- NONCE MANAGEMENT ---------------------------
+# Hands out nonces to the live mint/sync loops and keeps them consistent
+# with the node. A nonce counts as used once its transaction was accepted by
+# the node ("already known" included), whatever happens to the receipt
+# afterwards; a nonce whose send failed is handed back. The manager keeps the
+# hash of every transaction it sent until the account's latest nonce passes
+# it, so after an error it can tell which of its nonces the node has lost.
+#
+# Send errors are classified:
+#
+#   known        the node already has this exact transaction: treat as sent
+#   too_low      the nonce was used (by another process or an earlier run):
+#                resync and sign again with a fresh nonce
+#   underpriced  a different pending transaction holds the nonce: resync
+#   too_high     a lower nonce is missing: look for gaps
+#   other        the transaction was not sent; the nonce is handed back
+#
+# A gap is a nonce below the highest one sent whose transaction the node no
+# longer has (dropped from the mempool, or never sent); every later
+# transaction waits behind it. With fill=True gaps are filled with no-op
+# self-transfers (21000 gas, priced above anything that may still hold the
+# nonce); without it they are only reported, except a trailing gap, which is
+# closed by reusing the nonce.
+
+NOOP_GAS         = 21_000
+REPLACEMENT_BUMP = 1.125  # geth needs +10% to replace a pending transaction
+
+# Cosmos SDK EVM: "invalid nonce; got 5, expected 7"
+_GOT_EXPECTED = re.compile(r"got (\d+),? expected (\d+)")
+_EXPECTED_GOT = re.compile(r"expected (\d+),? got (\d+)")
+
+def classify_send_error(error):
+    """
+    'known', 'too_low', 'underpriced', 'too_high' or 'other'.
+    """
+    text = str(error).lower()
+    if "already known" in text or "known transaction" in text or "already imported" in text:
+        return "known"
+    if "underpriced" in text:
+        return "underpriced"
+    if "nonce too low" in text or "nonce is too low" in text:
+        return "too_low"
+    if "nonce too high" in text or "nonce is too high" in text:
+        return "too_high"
+    if "nonce" in text or "sequence" in text:
+        m = _GOT_EXPECTED.search(text)
+        if m:
+            got, expected = int(m.group(1)), int(m.group(2))
+        else:
+            m = _EXPECTED_GOT.search(text)
+            if m:
+                expected, got = int(m.group(1)), int(m.group(2))
+        if m:
+            return "too_low" if got < expected else "too_high"
+    return "other"
+
+class NonceManager:
+    def __init__(self, web3, account, chain_id, gas_price, fill=False):
+        self.web3 = web3
+        self.account = account
+        self.chain_id = chain_id
+        self.gas_price = gas_price
+        self.fill = fill
+        self.next = None
+        self.held = {}  # nonce -> tx hash, sent but not yet below the latest nonce
+        self.stats = {"sent": 0, "released": 0, "resyncs": 0, "gaps": 0, "filled": 0}
+
+    def latest(self):
+        return self.web3.eth.get_transaction_count(self.account.address, "latest")
+
+    def pending(self):
+        return self.web3.eth.get_transaction_count(self.account.address, "pending")
+
+    def sync(self):
+        """
+        Re-read the account's nonces and move 'next' past everything the
+        node or this manager knows to be used. Returns 'next'.
+        """
+        latest = self.latest()
+        pending = self.pending()
+        for nonce in [n for n in self.held if n < latest]:
+            del self.held[nonce]
+        self.next = max([latest, pending] + [n + 1 for n in self.held])
+        self.stats["resyncs"] += 1
+        logging.info(f"Nonces for {self.account.address}: latest {latest}, pending {pending}, next {self.next}.")
+        return self.next
+
+    def reserve(self, count=1):
+        """
+        First of 'count' consecutive nonces for new transactions.
+        """
+        if self.next is None:
+            self.sync()
+        nonce = self.next
+        self.next += count
+        return nonce
+
+    def sent(self, nonce, tx_hash):
+        self.held[nonce] = tx_hash
+        self.stats["sent"] += 1
+
+    def release(self, nonce):
+        """
+        Hand back a reserved nonce whose transaction was not sent. Nonces
+        above it that were not sent either go back too; if a later one is
+        already out, 'nonce' is left as a gap for repair().
+        """
+        if any(n > nonce for n in self.held):
+            logging.warning(f"Nonce {nonce} was not used but later nonces were sent; it is now a gap.")
+            return
+        if self.next is not None and nonce < self.next:
+            self.next = nonce
+            self.stats["released"] += 1
+
+    def failed(self, nonce, error):
+        """
+        Account for a send of 'nonce' that raised 'error'. Returns its kind
+        (see classify_send_error); for 'too_low', 'underpriced' and
+        'too_high' the nonces have been re-read and the caller may sign
+        again with a fresh nonce.
+        """
+        kind = classify_send_error(error)
+        if kind == "known":
+            return kind
+        if kind == "other":
+            self.release(nonce)
+            return kind
+        logging.warning(f"Nonce {nonce} rejected ({kind}): {error}")
+        if kind == "too_high":
+            self.release(nonce)
+            self.repair()
+        else:
+            self.sync()
+        return kind
+
+    def dropped(self, nonces):
+        """
+        The subset of 'nonces' (all in self.held) whose transaction the node
+        no longer knows.
+        """
+        from web3.exceptions import TransactionNotFound
+
+        lost = []
+        for nonce in nonces:
+            try:
+                if self.web3.eth.get_transaction(self.held[nonce]) is None:
+                    lost.append(nonce)
+            except TransactionNotFound:
+                lost.append(nonce)
+        return lost
+
+    def gaps(self):
+        """
+        Nonces from the account's latest nonce up to the highest one sent
+        that hold no transaction on the node.
+        """
+        latest = self.latest()
+        for nonce in [n for n in self.held if n < latest]:
+            del self.held[nonce]
+        if not self.held:
+            return []
+        top = max(self.held)
+        missing = [n for n in range(latest, top) if n not in self.held]
+        return sorted(missing + self.dropped([n for n in self.held if n >= latest]))
+
+    def repair(self):
+        """
+        Find gaps and fill them (fill=True) or report them. Returns the
+        nonces that are still gaps afterwards.
+        """
+        gaps = self.gaps()
+        if not gaps:
+            self.sync()
+            return []
+        self.stats["gaps"] += len(gaps)
+        alive = [n for n in self.held if n not in gaps]
+        if not alive or min(gaps) > max(alive):
+            # Only the last transactions were lost: nothing waits behind them.
+            for nonce in gaps:
+                self.held.pop(nonce, None)
+            self.sync()
+            return []
+        if not self.fill:
+            logging.error(f"Nonce gap(s) {gaps} block later transactions of {self.account.address}; "
+                          f"rerun with --fill-gaps to fill them with no-op transactions.")
+            self.sync()
+            return gaps
+        remaining = [nonce for nonce in gaps if not self.fill_nonce(nonce)]
+        self.sync()
+        return remaining
+
+    def fill_nonce(self, nonce):
+        replacing = nonce in self.held
+        tx = {
+            "chainId": self.chain_id,
+            "to": self.account.address,
+            "value": 0,
+            "gas": NOOP_GAS,
+            "gasPrice": int(self.gas_price * REPLACEMENT_BUMP) if replacing else self.gas_price,
+            "nonce": nonce,
+        }
+        signed = self.account.sign_transaction(tx)
+        try:
+            tx_hash = self.web3.eth.send_raw_transaction(signed.raw_transaction)
+        except Exception as e:
+            if classify_send_error(e) == "too_low":
+                # Mined after all, or filled by someone else.
+                self.held.pop(nonce, None)
+                return True
+            logging.error(f"Could not fill nonce {nonce}: {e}")
+            return False
+        logging.info(f"Filled nonce gap {nonce} with no-op transaction {tx_hash.hex()}.")
+        self.held[nonce] = tx_hash
+        self.stats["filled"] += 1
+        return True
+
+    def log_stats(self):
+        logging.info(f"Nonces: {self.stats['sent']} sent, {self.stats['released']} handed back, "
+                     f"{self.stats['resyncs']} resyncs, {self.stats['gaps']} gaps found, "
+                     f"{self.stats['filled']} filled.")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+import os
+import csv
+import time
+import zlib
+import logging
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+# --------------------------- STAGE PROFILER ---------------------------
+# Wraps the stages of a mint run (glob, read, estimate_gas, build_transaction,
+# sign_transaction, send, wait_receipt) so we can see where the time goes.
+#
+# Wall-clock timings are recorded for every IDCODE (a perf_counter call per
+# stage). cProfile and tracemalloc are only switched on for the sampled
+# IDCODEs, so a low sample rate can stay enabled during production runs.
+
+class StageProfiler:
+    def __init__(self, out_dir=None, sample_rate=1.0, trace_memory=False, top_n=25):
+        self.out_dir = out_dir
+        self.sample_rate = sample_rate
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+
+        self.idcode = None
+        self.sampled = False
+        self._profiles = {}   # stage -> cProfile.Profile for the current IDCODE
+        self._stack = []      # currently open stages (outermost first)
+        self._peaks = []      # per open stage, traced peak seen before the last reset_peak()
+        self._timings = {}    # stage -> [calls, seconds, peak_bytes] for the current IDCODE
+        self._rows = []       # finished timing rows for stage_times.csv
+
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.out_dir is not None
+
+    def is_sampled(self, idcode):
+        """
+        Deterministic per-IDCODE sampling, so re-running a campaign profiles
+        the same structures.
+        """
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        return (zlib.crc32(idcode.encode()) % 10000) < int(self.sample_rate * 10000)
+
+    def begin(self, idcode):
+        if not self.enabled:
+            return
+        if self.idcode is not None:
+            self.end()
+        self.idcode = idcode
+        self.sampled = self.is_sampled(idcode)
+        self._profiles = {}
+        self._timings = {}
+        if self.sampled and self.trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled or self.idcode is None:
+            yield
+            return
+
+        # Only one cProfile.Profile can be active at a time, so a nested
+        # stage pauses its parent and resumes it on exit.
+        outer = self._stack[-1] if self._stack else None
+        profile = None
+        if self.sampled:
+            if outer is not None and outer in self._profiles:
+                self._profiles[outer].disable()
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = cProfile.Profile()
+            profile.enable()
+        if self.sampled and self.trace_memory:
+            # reset_peak() wipes the parent's peak too; carry it over.
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        self._stack.append(name)
+        self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            carried = self._peaks.pop()
+            if profile is not None:
+                profile.disable()
+                if outer is not None and outer in self._profiles:
+                    self._profiles[outer].enable()
+
+            timing = self._timings.setdefault(name, [0, 0.0, 0])
+            timing[0] += 1
+            timing[1] += elapsed
+            if self.sampled and self.trace_memory:
+                peak = max(carried, tracemalloc.get_traced_memory()[1])
+                timing[2] = max(timing[2], peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def end(self):
+        if not self.enabled or self.idcode is None:
+            return
+        idcode = self.idcode
+
+        for name, (calls, seconds, peak) in self._timings.items():
+            self._rows.append((idcode, name, calls, f"{seconds:.6f}", peak, int(self.sampled)))
+
+        if self.sampled:
+            idcode_dir = os.path.join(self.out_dir, idcode)
+            os.makedirs(idcode_dir, exist_ok=True)
+            for name, profile in self._profiles.items():
+                profile.dump_stats(os.path.join(idcode_dir, f"{name}.prof"))
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self._write_top_allocations(snapshot, os.path.join(idcode_dir, "allocations.txt"))
+            logging.info(f"Profile for {idcode} written to {idcode_dir}")
+
+        self.idcode = None
+        self.sampled = False
+        self._profiles = {}
+        self._timings = {}
+
+    def _write_top_allocations(self, snapshot, path):
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        with open(path, "w") as f:
+            f.write(f"Top {self.top_n} allocation sites for {self.idcode}\n")
+            for stat in snapshot.statistics("lineno")[:self.top_n]:
+                f.write(f"{stat}\n")
+            f.write("\nPeak traced bytes per stage\n")
+            for name, (_, _, peak) in self._timings.items():
+                f.write(f"{name}: {peak}\n")
+
+    def close(self):
+        if not self.enabled:
+            return
+        self.end()
+        path = os.path.join(self.out_dir, "stage_times.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["IDCODE", "STAGE", "CALLS", "SECONDS", "PEAK_TRACED_BYTES", "SAMPLED"])
+            writer.writerows(self._rows)
+        logging.info(f"Stage timings written to {path}")
+
+
+NULL_PROFILER = StageProfiler()
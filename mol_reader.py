@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+import logging
+
+from mol_rpc import rpc_call
+from mol_multicall import CallBatcher
+
+# --------------------------- CONTRACT READS ---------------------------
+# View calls against MolNFT without building a web3 contract object: calldata
+# is encoded with eth_abi from the cached selector table (mol_abi) and many
+# calls go out together through CallBatcher (JSON-RPC batches, optionally
+# packed into Multicall3 aggregate3 calls). Used by the bulk read commands
+# (verify, sync, export) and the gateway.
+#
+# Child chunks are read with getCombinedDataRange, many children per call,
+# sized from the first chunk to about RANGE_CHARS characters; a call that
+# fails (e.g. over the node's eth_call gas cap) is split in halves. Contracts
+# deployed before getCombinedDataRange existed are read with one getMetadata
+# per child instead.
+
+CHILD_PAGE  = 200      # children per getChildrenPaginated call
+CHUNK_BATCH = 16       # getMetadata calls per JSON-RPC batch (each returns a full chunk)
+RANGE_CHARS = 1 << 20  # fileBase64 characters per getCombinedDataRange call (bounds eth_call gas)
+
+# getMetadata output positions
+META_FIELDS = [
+    "IDCODE", "HEADER", "ACCESSION_DATE", "COMPOUND", "SOURCE", "AUTHOR_LIST",
+    "RESOLUTION", "EXPERIMENT_TYPE", "SEQUENCE", "imageBase64", "fileBase64",
+]
+FILE_FIELD = META_FIELDS.index("fileBase64")
+
+class CallError(Exception):
+    pass
+
+def is_bare_revert(error):
+    """
+    True for a JSON-RPC error that is a revert with neither a reason nor
+    return data: the selector matched no function (MolNFT has no fallback),
+    as opposed to a require() failing inside one.
+    """
+    data = error.get("data") if isinstance(error, dict) else None
+    if isinstance(data, dict):  # some nodes nest the revert data one level down
+        data = data.get("data")
+    if data not in (None, "", "0x"):
+        return False
+    message = str(error.get("message", "") if isinstance(error, dict) else error).lower().strip()
+    return message.endswith("revert") or message.endswith("reverted") or "selector was not recognized" in message
+
+class ContractReader:
+    def __init__(self, web3, address, block="latest", multicall=None):
+        from mol_abi import find_function
+
+        self.web3 = web3
+        self.address = address
+        self.block = block
+        self.batcher = CallBatcher(web3, multicall, block)
+        self._functions = {}
+        self._find_function = find_function
+        self._ranges = None  # whether the contract has getCombinedDataRange
+
+    def function(self, name):
+        if name not in self._functions:
+            selector, record = self._find_function(name)
+            self._functions[name] = (bytes.fromhex(selector[2:]), record["inputs"], record["outputs"])
+        return self._functions[name]
+
+    def encode(self, name, args):
+        return "0x" + self.encode_bytes(name, args).hex()
+
+    def encode_bytes(self, name, args):
+        from eth_abi import encode
+
+        selector, inputs, _ = self.function(name)
+        return selector + encode(inputs, list(args))
+
+    def decode(self, name, result):
+        from eth_abi import decode
+
+        _, _, outputs = self.function(name)
+        values = decode(outputs, bytes.fromhex(result[2:]))
+        return values[0] if len(values) == 1 else values
+
+    def _params(self, name, args):
+        return [{"to": self.address, "data": self.encode(name, args)}, self.block]
+
+    def call(self, name, *args):
+        result, error = rpc_call(self.web3, "eth_call", self._params(name, args))
+        if error is not None:
+            raise CallError(f"{name}{tuple(args)} failed: {error}")
+        return self.decode(name, result)
+
+    def call_many(self, name, args_list, batch=None):
+        """
+        Same view function over many argument tuples, at most 'batch' per
+        request (None: sized by the batcher). Returns decoded values, or a
+        CallError instance in place of a failed call.
+        """
+        return self.call_multi([(name, args) for args in args_list], batch)
+
+    def call_multi(self, calls, batch=None):
+        """
+        Like call_many for a mix of functions: [(name, args), ...].
+        """
+        encoded = [(self.address, self.encode_bytes(name, args)) for name, args in calls]
+        out = []
+        for (result, error), (name, args) in zip(self.batcher.run(encoded, batch), calls):
+            if error is not None or result is None:
+                out.append(CallError(f"{name}{tuple(args)} failed: {error}"))
+            else:
+                out.append(self.decode(name, result))
+        return out
+
+    def children(self, parent_id, page=CHILD_PAGE):
+        child_ids = []
+        offset = 0
+        while True:
+            ids, total = self.call("getChildrenPaginated", parent_id, offset, page)
+            child_ids.extend(ids)
+            offset += len(ids)
+            if not ids or offset >= total:
+                return child_ids
+
+    def chunks(self, child_ids, batch=CHUNK_BATCH):
+        """
+        fileBase64 of each child, in order. Failed calls come back as CallError.
+        """
+        out = []
+        for start in range(0, len(child_ids), batch):
+            page = child_ids[start:start + batch]
+            for value in self.call_many("getMetadata", [(cid,) for cid in page], batch=batch):
+                out.append(value if isinstance(value, CallError) else value[FILE_FIELD])
+        return out
+
+    def supports_ranges(self, parent_id):
+        """
+        Only a bare revert marks the contract as lacking getCombinedDataRange;
+        a require() failing for this 'parent_id' says the function exists and
+        is left to the range read itself to report.
+        """
+        if self._ranges is None:
+            result, error = rpc_call(self.web3, "eth_call", self._params("getCombinedDataRange", (parent_id, 0, 0)))
+            if error is None:
+                self._ranges = True
+            elif is_bare_revert(error):
+                logging.info("Contract has no getCombinedDataRange; reading chunks with getMetadata.")
+                self._ranges = False
+            else:
+                return "revert" in str(error).lower()
+        return self._ranges
+
+    def chunk_range(self, parent_id, child_ids, start, end):
+        """
+        fileBase64 of children [start, end) of 'parent_id' ('child_ids' is
+        its full child list), split at the lengths getCombinedDataRange
+        returns. Failed reads come back as CallError.
+        """
+        if not self.supports_ranges(parent_id):
+            return self.chunks(child_ids[start:end])
+        try:
+            text, lengths = self.call("getCombinedDataRange", parent_id, start, end)
+        except CallError as e:
+            if end - start <= 1:
+                return [e] * (end - start)
+            middle = (start + end) // 2
+            return (self.chunk_range(parent_id, child_ids, start, middle)
+                    + self.chunk_range(parent_id, child_ids, middle, end))
+        out = []
+        pos = 0
+        for length in lengths:
+            out.append(text[pos:pos + length])
+            pos += length
+        # Fewer children than asked for: the child list changed since it was read
+        for index in range(start + len(out), end):
+            out.append(CallError(f"child {index} of {parent_id} is gone"))
+        return out
+
+    def range_step(self, parent_id, sample):
+        """
+        Children per chunk_range call, given one chunk's fileBase64.
+        """
+        if not self.supports_ranges(parent_id):
+            return CHUNK_BATCH
+        length = len(sample) if isinstance(sample, str) else 0
+        return max(1, RANGE_CHARS // max(1, length))
+
+    def file_chunks(self, parent_id, child_ids, first=0):
+        """
+        fileBase64 of child_ids[first:] (children of 'parent_id'), in order.
+        Failed reads come back as CallError.
+        """
+        out = self.chunk_range(parent_id, child_ids, first, min(first + 1, len(child_ids)))
+        if not out:
+            return out
+        step = self.range_step(parent_id, out[0])
+        for start in range(first + 1, len(child_ids), step):
+            out += self.chunk_range(parent_id, child_ids, start, min(start + step, len(child_ids)))
+        return out
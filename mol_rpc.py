@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import logging
+
+# --------------------------- JSON-RPC BATCHING ---------------------------
+# Raw JSON-RPC helpers shared by the bulk commands. Calls go out as JSON-RPC
+# batches when the provider and node support it and fall back to one request
+# per call otherwise. Results are the raw JSON values (hex strings, dicts).
+
+MAX_BATCH = 100
+
+_batch_supported = True
+
+def rpc_call(web3, method, params):
+    response = web3.provider.make_request(method, params)
+    return response.get("result"), response.get("error")
+
+def rpc_batch(web3, calls, max_batch=MAX_BATCH):
+    """
+    Run [(method, params), ...] and return [(result, error), ...] in the same
+    order.
+    """
+    global _batch_supported
+    results = []
+    for start in range(0, len(calls), max_batch):
+        chunk = calls[start:start + max_batch]
+        responses = None
+        if _batch_supported and len(chunk) > 1 and hasattr(web3.provider, "make_batch_request"):
+            try:
+                responses = web3.provider.make_batch_request(chunk)
+                if not isinstance(responses, list) or len(responses) != len(chunk):
+                    logging.warning("Node rejected a JSON-RPC batch; falling back to single requests.")
+                    _batch_supported = False
+                    responses = None
+            except Exception as e:
+                logging.warning(f"JSON-RPC batch failed ({e}); falling back to single requests.")
+                _batch_supported = False
+                responses = None
+        if responses is None:
+            results.extend(rpc_call(web3, method, params) for method, params in chunk)
+        else:
+            results.extend((r.get("result"), r.get("error")) for r in responses)
+    return results
+
+def hex_to_int(value):
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+import os
+import re
+import logging
+import sqlite3
+
+from mol_abi import CACHE_DIR
+from mol_reader import CallError
+
+# --------------------------- SEQUENCE K-MER INDEX ---------------------------
+# Local replacement for searchBySEQUENCE, which scans every token's SEQUENCE
+# byte by byte on chain. Every parent token's SEQUENCE is normalized
+# (whitespace removed, upper case; the contract compares lower-cased) and
+# its distinct K-mers go into an inverted index in SQLite:
+#
+#   substring   tokens holding every K-mer of the query are the only
+#               candidates; each is then checked with a plain substring test.
+#               Queries shorter than K scan the stored sequences.
+#   similar     tokens ranked by the share of the query's K-mers they hold.
+#
+# The index remembers the highest tokenId it has read and update() only
+# reads the parents minted since. updateMetadata leaves no trace on chain to
+# follow, so edited sequences need rebuild().
+
+K            = 5
+UPDATE_BATCH = 100
+INDEX_DIR    = os.path.join(CACHE_DIR, "seqindex")
+SEQUENCE     = 8  # getMetadata output position
+
+_SPACE = re.compile(r"\s+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sequences (token_id INTEGER PRIMARY KEY, idcode TEXT, sequence TEXT);
+CREATE TABLE IF NOT EXISTS kmers (kmer TEXT, token_id INTEGER, PRIMARY KEY (kmer, token_id)) WITHOUT ROWID;
+"""
+
+def normalize(sequence):
+    return _SPACE.sub("", sequence).upper()
+
+def kmers(sequence, k=K):
+    return {sequence[i:i + k] for i in range(len(sequence) - k + 1)}
+
+def index_path(address):
+    return os.path.join(INDEX_DIR, f"{address.lower()}.sqlite")
+
+class SequenceIndex:
+    def __init__(self, path, k=K):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        stored = self.get_meta("k")
+        if stored is not None and int(stored) != k:
+            raise ValueError(f"{path} was built with k={stored}; rebuild it to use k={k}")
+        self.set_meta("k", k)
+        self.k = k
+
+    def get_meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def last_token(self):
+        return int(self.get_meta("last_token") or 0)
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM sequences").fetchone()[0]
+
+    def add(self, token_id, idcode, sequence):
+        sequence = normalize(sequence)
+        old = self.db.execute("SELECT sequence FROM sequences WHERE token_id = ?", (token_id,)).fetchone()
+        if old is not None:
+            # By primary key: kmers has no index on token_id alone
+            self.db.executemany("DELETE FROM kmers WHERE kmer = ? AND token_id = ?",
+                                ((kmer, token_id) for kmer in kmers(old[0], self.k)))
+        self.db.execute("INSERT OR REPLACE INTO sequences VALUES (?, ?, ?)", (token_id, idcode, sequence))
+        self.db.executemany("INSERT INTO kmers VALUES (?, ?)", ((kmer, token_id) for kmer in kmers(sequence, self.k)))
+
+    def update(self, reader, batch=UPDATE_BATCH):
+        """
+        Index the parents minted since the last update. Returns the number
+        of tokens added; stops before a token that could not be read.
+        """
+        first = self.last_token + 1
+        end = reader.call("nextNFTId")
+        added = 0
+        for start in range(first, end, batch):
+            token_ids = list(range(start, min(start + batch, end)))
+            for token_id, metadata in zip(token_ids, reader.call_many("getMetadata", [(t,) for t in token_ids])):
+                if isinstance(metadata, CallError):
+                    self.db.commit()
+                    raise metadata
+                self.add(token_id, metadata[0], metadata[SEQUENCE])
+                self.set_meta("last_token", token_id)
+                added += 1
+            self.db.commit()
+            logging.info(f"Indexed sequences up to token {token_ids[-1]}.")
+        return added
+
+    def rebuild(self, reader, batch=UPDATE_BATCH):
+        self.db.executescript("DELETE FROM kmers; DELETE FROM sequences; DELETE FROM meta WHERE key = 'last_token';")
+        return self.update(reader, batch)
+
+    def _load_query(self, grams):
+        # A temp table rather than IN (?, ...) keeps long queries under
+        # SQLite's bound-parameter limit; the CROSS JOINs below keep it as
+        # the outer loop so only the query's posting lists are read.
+        self.db.execute("CREATE TEMP TABLE IF NOT EXISTS query (kmer TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.db.execute("DELETE FROM query")
+        self.db.executemany("INSERT INTO query VALUES (?)", ((g,) for g in grams))
+
+    def substring(self, query, limit=None):
+        """
+        [(token_id, idcode, [positions])] of sequences containing 'query'.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if len(query) < self.k:
+            rows = self.db.execute("SELECT token_id, idcode, sequence FROM sequences WHERE instr(sequence, ?) > 0 "
+                                   "ORDER BY token_id", (query,))
+        else:
+            grams = kmers(query, self.k)
+            self._load_query(grams)
+            rows = self.db.execute(
+                "SELECT s.token_id, s.idcode, s.sequence FROM sequences s JOIN "
+                "(SELECT token_id FROM query CROSS JOIN kmers USING (kmer) GROUP BY token_id HAVING COUNT(*) = ?) c "
+                "ON s.token_id = c.token_id ORDER BY s.token_id", (len(grams),))
+        matches = []
+        for token_id, idcode, sequence in rows:
+            positions = [m.start() for m in re.finditer(f"(?={re.escape(query)})", sequence)]
+            if positions:
+                matches.append((token_id, idcode, positions))
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+
+    def similar(self, query, top=20):
+        """
+        [(token_id, idcode, score)] by the share of the query's K-mers found
+        in each sequence, best first (ties: shorter sequence first).
+        """
+        grams = kmers(normalize(query), self.k)
+        if not grams:
+            return []
+        self._load_query(grams)
+        rows = self.db.execute(
+            "SELECT s.token_id, s.idcode, c.shared FROM sequences s JOIN "
+            "(SELECT token_id, COUNT(*) AS shared FROM query CROSS JOIN kmers USING (kmer) GROUP BY token_id) c "
+            "ON s.token_id = c.token_id ORDER BY c.shared DESC, length(s.sequence), s.token_id LIMIT ?", (top,))
+        return [(token_id, idcode, shared / len(grams)) for token_id, idcode, shared in rows]
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
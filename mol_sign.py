@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+import os
+import queue
+import logging
+from multiprocessing import Pool
+
+from mol_memory import ByteBudget, IN_FLIGHT_FACTOR
+
+# --------------------------- PARALLEL SIGNING ---------------------------
+# ABI-encoding mintNFT (a SEQUENCE, imageBase64 and a multi-MB fileBase64) and
+# signing the transaction are pure Python and CPU bound. SigningPool spreads
+# both over worker processes. Each job carries its nonce; results come back in
+# any order and are released strictly in nonce order, so the caller can
+# broadcast them as they arrive.
+#
+# Workers encode with eth_abi against the cached mintNFT selector from
+# mol_abi, so they never build a web3 contract object.
+
+MINT_FUNCTION = "mintNFT"
+
+# Offline gas model for mintNFT, used when no node is available to
+# estimate_gas (air-gapped signing). Deliberately on the high side: an unused
+# gas limit is refunded, an exceeded one reverts.
+TX_BASE_GAS       = 21_000
+MINT_BASE_GAS     = 250_000   # ERC721Enumerable bookkeeping, allTokens/children pushes, event
+SSTORE_SET_GAS    = 22_100    # zero -> non-zero storage slot, cold
+CALLDATA_BYTE_GAS = 16        # non-zero calldata byte (base64 text is never zero)
+CALLDATA_ZERO_GAS = 4
+GAS_MARGIN        = 1.2
+
+# Where the contract keeps fileBase64:
+#
+#   slots     a string in storage (molnft.sol and the editor variants):
+#             SSTORE_SET_GAS per 32 bytes
+#   sstore2   the runtime code of data contracts of up to DATA_CONTRACT_SIZE
+#             bytes (molnft_editor_version_sstore2.sol): CREATE_GAS and a
+#             pointer slot per contract, CODE_DEPOSIT_GAS per byte
+LAYOUTS            = ("slots", "sstore2")
+CREATE_GAS         = 32_000
+CODE_DEPOSIT_GAS   = 200
+INITCODE_WORD_GAS  = 2       # EIP-3860
+DATA_CONTRACT_SIZE = 24_575  # EIP-170 code size limit minus the leading STOP byte
+
+_account = None
+_selector = None
+_input_types = None
+
+def string_storage_gas(length):
+    """
+    Solidity stores strings of 32+ bytes as a length slot plus one slot per
+    32-byte word; shorter ones share a single slot.
+    """
+    if length == 0:
+        return 0
+    if length < 32:
+        return SSTORE_SET_GAS
+    return SSTORE_SET_GAS * (1 + (length + 31) // 32)
+
+def data_contract_gas(length):
+    """
+    Deploying 'length' bytes as data contracts and recording their addresses.
+    """
+    if length == 0:
+        return 0
+    contracts = (length + DATA_CONTRACT_SIZE - 1) // DATA_CONTRACT_SIZE
+    initcode_words = (length + 12 * contracts + 31) // 32
+    return (contracts * (CREATE_GAS + SSTORE_SET_GAS) + SSTORE_SET_GAS  # pointers + array length
+            + INITCODE_WORD_GAS * initcode_words + CODE_DEPOSIT_GAS * (length + contracts))
+
+def estimate_mint_gas(string_lengths, margin=GAS_MARGIN, layout="slots"):
+    """
+    Gas limit for a mintNFT call whose string arguments have the given byte
+    lengths (the twelve strings in ABI order, or any subset that is non-empty;
+    the last one is fileBase64). margin=1.0 gives the expected gas used
+    rather than a safe limit. 'layout' is one of LAYOUTS.
+    """
+    words = sum((n + 31) // 32 for n in string_lengths)
+    calldata = 4 + 32 * (13 + len(string_lengths))  # selector, head, length words
+    calldata_gas = CALLDATA_BYTE_GAS * sum(string_lengths) + CALLDATA_ZERO_GAS * calldata
+    memory_gas = 3 * words + words * words // 512   # strings copied to memory once
+    if layout == "sstore2" and string_lengths:
+        storage_gas = (sum(string_storage_gas(n) for n in string_lengths[:-1])
+                       + data_contract_gas(string_lengths[-1]))
+    else:
+        storage_gas = sum(string_storage_gas(n) for n in string_lengths)
+    return int((TX_BASE_GAS + MINT_BASE_GAS + calldata_gas + memory_gas + storage_gas) * margin)
+
+def init_worker(private_key):
+    global _account, _selector, _input_types
+    from eth_account import Account
+    from mol_abi import find_function
+
+    _account = Account.from_key(private_key)
+    selector, record = find_function(MINT_FUNCTION)
+    _selector = bytes.fromhex(selector[2:])
+    _input_types = record["inputs"]
+
+def encode_mint_calldata(owner, metadata, image_base64, file_base64, parent_id):
+    """
+    Calldata for mintNFT(to, IDCODE, ..., SEQUENCE, imageBase64, fileBase64, parentId).
+    'metadata' is the nine string fields in ABI order.
+    """
+    from eth_abi import encode
+
+    return _selector + encode(_input_types, [owner, *metadata, image_base64, file_base64, parent_id])
+
+def load_job_image(job):
+    if job.get("image_file"):
+        with open(job["image_file"], "r") as f:
+            return f.read().strip()
+    return job.get("image_base64", "")
+
+def load_job_data(job):
+    if job.get("file_base64") is not None:
+        return job["file_base64"]
+    with open(job["data_file"], "r") as f:
+        data = f.read().strip()
+    if not data:
+        raise ValueError(f"Empty molecular data file {job['data_file']}")
+    return data
+
+def sign_job(job):
+    """
+    Worker entry point. Returns (nonce, result, error) so a failing job does
+    not take the pool down; the caller decides what a missing nonce means.
+    """
+    try:
+        calldata = encode_mint_calldata(
+            job["owner"],
+            job["metadata"],
+            load_job_image(job),
+            load_job_data(job),
+            job["parent_id"],
+        )
+        tx = {
+            "chainId": job["chain_id"],
+            "to": job["contract"],
+            "value": 0,
+            "gas": job["gas"],
+            "gasPrice": job["gas_price"],
+            "nonce": job["nonce"],
+            "data": calldata,
+        }
+        signed = _account.sign_transaction(tx)
+        result = {
+            "nonce": job["nonce"],
+            "raw_transaction": bytes(signed.raw_transaction),
+            "tx_hash": bytes(signed.hash),
+            "calldata_bytes": len(calldata),
+            "idcode": job.get("idcode", ""),
+            "part": job.get("part", 0),
+            "token_id": job.get("token_id"),
+            "parent_id": job["parent_id"],
+        }
+        return job["nonce"], result, None
+    except Exception as e:
+        return job["nonce"], None, f"{type(e).__name__}: {e}"
+
+def job_bytes(job):
+    """
+    Payload bytes a job carries into the transaction (files and inline strings).
+    """
+    size = sum(len(field) for field in job.get("metadata", []))
+    for key in ("image_file", "data_file"):
+        if job.get(key):
+            size += os.path.getsize(job[key])
+    for key in ("image_base64", "file_base64"):
+        size += len(job.get(key) or "")
+    return size
+
+# Seconds between checks, while waiting for results, that no worker has died.
+WORKER_CHECK = 5.0
+
+class SigningPool:
+    def __init__(self, private_key, workers=None, budget=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget or ByteBudget()
+        self.pool = Pool(self.workers, initializer=init_worker, initargs=(private_key,))
+        self.pids = self.worker_pids()
+        self.lost_worker = False
+
+    def worker_pids(self):
+        # Pool replaces a worker process that dies, but the job it was running
+        # never reports back; a changed set of pids is the only sign of it.
+        return {process.pid for process in self.pool._pool}
+
+    def sign(self, jobs):
+        """
+        Sign 'jobs' (dicts with contiguous nonces) in the pool and yield the
+        results in nonce order. Stops at the first job that failed, since
+        later nonces cannot be broadcast past the gap.
+
+        Jobs are handed to the workers only while their payload fits in the
+        byte budget; a result's charge is released when the caller asks for
+        the next one, i.e. once it has been broadcast or written out.
+        """
+        jobs = sorted(jobs, key=lambda j: j["nonce"])
+        if not jobs:
+            return
+        budget = self.budget
+        charges = {j["nonce"]: job_bytes(j) * IN_FLIGHT_FACTOR for j in jobs}
+        held = {}  # nonce -> stage currently charged
+        done = queue.Queue()
+        queued = iter(jobs)
+        head = next(queued, None)
+        in_flight = 0
+        next_nonce = jobs[0]["nonce"]
+        pending = {}
+        failed = None
+
+        def move(nonce, stage):
+            budget.move(charges[nonce], held[nonce], stage)
+            held[nonce] = stage
+
+        try:
+            while True:
+                while head is not None and failed is None:
+                    nonce = head["nonce"]
+                    if not budget.try_acquire(charges[nonce], "signing", force=not held):
+                        break
+                    held[nonce] = "signing"
+                    self.pool.apply_async(sign_job, (head,), callback=done.put,
+                                          error_callback=lambda e, n=nonce: done.put((n, None, repr(e))))
+                    in_flight += 1
+                    head = next(queued, None)
+                if in_flight == 0:
+                    break
+
+                try:
+                    nonce, result, error = done.get(timeout=WORKER_CHECK)
+                except queue.Empty:
+                    pids = self.worker_pids()
+                    if pids == self.pids:
+                        continue
+                    self.pids = pids
+                    self.lost_worker = True
+                    lost = sorted(n for n, stage in held.items() if stage == "signing")
+                    if lost:
+                        logging.error(f"A signing worker exited; giving up on nonces {lost[0]}..{lost[-1]}.")
+                        failed = lost[0] if failed is None else min(failed, lost[0])
+                        for n in lost:
+                            budget.release(charges[n], held.pop(n))
+                        in_flight -= len(lost)
+                    continue
+                in_flight -= 1
+                if error is not None:
+                    logging.error(f"Signing nonce {nonce} failed: {error}")
+                    failed = nonce if failed is None else min(failed, nonce)
+                    budget.release(charges[nonce], held.pop(nonce))
+                    continue
+                move(nonce, "signed")
+                pending[nonce] = result
+                while next_nonce in pending and (failed is None or next_nonce < failed):
+                    result = pending.pop(next_nonce)
+                    move(next_nonce, "broadcast")
+                    yield result
+                    result = None
+                    budget.release(charges[next_nonce], held.pop(next_nonce))
+                    next_nonce += 1
+        finally:
+            # Results dropped behind a gap, or jobs still in a worker when the
+            # caller stopped early (their results are discarded with 'done').
+            for nonce, stage in held.items():
+                budget.release(charges[nonce], stage)
+        if failed is not None:
+            logging.error(f"Dropped signed transactions from nonce {failed} on: nonce gap.")
+
+    def close(self):
+        if self.lost_worker:
+            # The job of a dead worker stays pending forever, so join() would hang.
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is not None:
+            self.pool.terminate()
+        else:
+            self.close()
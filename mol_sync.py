@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from mol_reader import CallError, FILE_FIELD, META_FIELDS
+from mol_verify import sha256_text
+
+# --------------------------- INCREMENTAL RE-SYNC ---------------------------
+# Plans the minimum set of transactions that makes a minted structure match
+# its local files again:
+#
+#   update_child   updateMetadata on a child whose chunk hash changed
+#   append_child   mintNFT for local parts beyond the current child count
+#   blank_child    updateMetadata with an empty fileBase64 for children past
+#                  the local part count (tokens cannot be removed, and empty
+#                  chunks keep getCombinedData correct)
+#   update_parent  updateMetadata on the parent when a metadata field, the
+#                  image or the parent's own fileBase64 changed
+#
+# Requires an editor variant of the contract (updateMetadata is editor-only).
+
+class SyncAction:
+    def __init__(self, kind, token_id=None, part_file=None, fields=None, position=None):
+        self.kind = kind
+        self.token_id = token_id
+        self.part_file = part_file
+        self.fields = fields        # full 11-field list for update_parent
+        self.position = position    # child index
+
+    def __repr__(self):
+        target = self.token_id if self.token_id is not None else f"new child #{self.position}"
+        return f"{self.kind}({target}{', ' + self.part_file if self.part_file else ''})"
+
+def plan_sync(reader, token_id, row, image_data, parent_file, part_files, read_file):
+    """
+    Returns (idcode, actions) for one parent token. 'row' is its CSV row (or
+    None to leave the parent's metadata alone), 'image_data' the local image
+    (or None to keep the on-chain one).
+    """
+    metadata = list(reader.call("getMetadata", token_id))
+    idcode = metadata[0]
+    child_ids = reader.children(token_id)
+    chain_chunks = reader.file_chunks(token_id, child_ids)
+    for chunk in chain_chunks:
+        if isinstance(chunk, CallError):
+            raise chunk
+    chain_digests = [sha256_text(chunk) for chunk in chain_chunks]
+
+    if part_files:
+        desired_parent_file = ""
+        desired_children = part_files
+    else:
+        desired_parent_file = read_file(parent_file) if parent_file else metadata[FILE_FIELD]
+        desired_children = []
+
+    actions = []
+    for i in range(max(len(child_ids), len(desired_children))):
+        if i < len(child_ids) and i < len(desired_children):
+            data = read_file(desired_children[i]) or ""
+            if sha256_text(data) != chain_digests[i]:
+                actions.append(SyncAction("update_child", child_ids[i], desired_children[i], position=i))
+        elif i < len(desired_children):
+            actions.append(SyncAction("append_child", part_file=desired_children[i], position=i))
+        elif chain_chunks[i]:
+            actions.append(SyncAction("blank_child", child_ids[i], position=i))
+
+    desired = list(metadata)
+    if row is not None:
+        desired[0] = (row.get("IDCODE") or idcode).strip()
+        for n, field in enumerate(META_FIELDS[1:9], start=1):
+            desired[n] = row.get(field, "").strip()
+    if image_data is not None:
+        desired[9] = image_data
+    desired[FILE_FIELD] = desired_parent_file
+    if desired != metadata:
+        actions.append(SyncAction("update_parent", token_id, fields=desired))
+    return idcode, actions
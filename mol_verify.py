@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from mol_reader import CallError, FILE_FIELD
+
+# --------------------------- ON-CHAIN VERIFICATION ---------------------------
+# Compares what the contract returns for a parent token (its own fileBase64
+# plus the fileBase64 of every child, in child order) with the local
+# .bcif.gz.base64 files for its IDCODE. Chunks are compared by SHA-256, so
+# missing, extra and reordered parts can be told apart, and the whole file is
+# compared by the SHA-256 of the concatenation.
+
+WORKERS = 8
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def parse_token_spec(spec):
+    """
+    "1-20,35,40-41" -> [1, ..., 20, 35, 40, 41]
+    """
+    tokens = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "-" in item:
+            start, end = item.split("-", 1)
+            tokens.extend(range(int(start), int(end) + 1))
+        else:
+            tokens.append(int(item))
+    return tokens
+
+def compare_chunks(local, chain):
+    """
+    'local' and 'chain' are lists of chunk digests in order. Returns
+    (missing, extra, out_of_order): local indexes with no matching chain
+    chunk, chain indexes with no matching local chunk, and (local, chain)
+    index pairs for chunks present on both sides at different positions.
+    """
+    chain_positions = {}
+    for j, digest in enumerate(chain):
+        chain_positions.setdefault(digest, []).append(j)
+    local_digests = set(local)
+
+    missing = []
+    out_of_order = []
+    for i, digest in enumerate(local):
+        if i < len(chain) and chain[i] == digest:
+            continue
+        positions = chain_positions.get(digest)
+        if positions:
+            out_of_order.append((i, positions[0]))
+        else:
+            missing.append(i)
+    extra = [j for j, digest in enumerate(chain) if digest not in local_digests]
+    return missing, extra, out_of_order
+
+def local_chunks(idcode, local_files, read_file):
+    """
+    Returns (files, chunk digests, whole-file digest) for the local data of
+    'idcode', or (None, [], None) if there is none.
+    """
+    parent_file, part_files = local_files(idcode)
+    files = part_files or ([parent_file] if parent_file else [])
+    if not files:
+        return None, [], None
+    digests = []
+    whole = hashlib.sha256()
+    for path in files:
+        data = read_file(path) or ""
+        digests.append(sha256_text(data))
+        whole.update(data.encode())
+    return files, digests, whole.hexdigest()
+
+def verify_token(reader, token_id, local_files, read_file):
+    result = {"token_id": token_id, "idcode": None, "status": "ok"}
+    try:
+        metadata = reader.call("getMetadata", token_id)
+        idcode = metadata[0]
+        result["idcode"] = idcode
+        child_ids = reader.children(token_id)
+        chain_data = [metadata[FILE_FIELD]] if metadata[FILE_FIELD] else []
+        chain_ids = [token_id] if chain_data else []
+        chain_data += reader.file_chunks(token_id, child_ids)
+        chain_ids += child_ids
+    except CallError as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        return result
+
+    failed = [cid for cid, data in zip(chain_ids, chain_data) if isinstance(data, CallError)]
+    chain_digests = [None if isinstance(data, CallError) else sha256_text(data) for data in chain_data]
+    chain_whole = hashlib.sha256()
+    for data in chain_data:
+        if not isinstance(data, CallError):
+            chain_whole.update(data.encode())
+
+    files, digests, local_whole = local_chunks(idcode, local_files, read_file)
+    result["chunks_chain"] = len(chain_digests)
+    result["sha256_chain"] = chain_whole.hexdigest()
+    if files is None:
+        result["status"] = "no_local"
+        return result
+    result["chunks_local"] = len(digests)
+    result["sha256_local"] = local_whole
+
+    missing, extra, out_of_order = compare_chunks(digests, chain_digests)
+    result["missing"] = [files[i] for i in missing]
+    result["extra"] = [chain_ids[j] for j in extra if chain_digests[j] is not None]
+    result["out_of_order"] = [[files[i], j] for i, j in out_of_order]
+    result["failed_reads"] = failed
+    if missing or result["extra"] or out_of_order or failed or result["sha256_local"] != result["sha256_chain"]:
+        result["status"] = "mismatch"
+    return result
+
+def verify_tokens(reader, token_ids, local_files, read_file, workers=WORKERS):
+    """
+    Verify 'token_ids' concurrently; yields results in token order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(verify_token, reader, t, local_files, read_file) for t in token_ids]
+        for token_id, future in zip(token_ids, futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                logging.error(f"Verification of token {token_id} failed: {e}")
+                yield {"token_id": token_id, "idcode": None, "status": "error", "error": str(e)}
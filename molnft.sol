@@ -277,19 +277,45 @@ contract MolNFT is ERC721Enumerable, Ownable {
     }
 
     // ------------------------ CONCAT FILES ------------------------------------
+    // The combined file is built in a single allocation: one pass adds up the
+    // stored lengths, a second copies each fileBase64 from storage straight
+    // into the result, so gas grows linearly with the data. Structures too
+    // large for one eth_call can be read in bounded pieces with
+    // getCombinedDataRange.
 
     function getCombinedData(uint256 parentId) external view returns (string memory combinedFileBase64) {
         require(parentId < 100_000_000, "Only parent NFTs can have combined files.");
         require(tokenExists(parentId), "Parent token does not exist.");
 
-        NFTData storage parentData = nftData[parentId];
-        combinedFileBase64 = parentData.fileBase64;
+        combinedFileBase64 = _combineFiles(parentId, 0, children[parentId].length, true);
+    }
+
+    /**
+     * @dev fileBase64 of children [fromChild, toChild) of a parent joined in
+     * child order, and the length of each. toChild is clamped to the child
+     * count. The parent's own fileBase64 (getMetadata) is not included.
+     */
+    function getCombinedDataRange(
+        uint256 parentId,
+        uint256 fromChild,
+        uint256 toChild
+    ) external view returns (string memory combinedFileBase64, uint256[] memory lengths) {
+        require(parentId < 100_000_000, "Only parent NFTs can have combined files.");
+        require(tokenExists(parentId), "Parent token does not exist.");
 
         uint256[] storage childIds = children[parentId];
-        for (uint256 i = 0; i < childIds.length; i++) {
-            NFTData storage childData = nftData[childIds[i]];
-            combinedFileBase64 = string(abi.encodePacked(combinedFileBase64, childData.fileBase64));
+        if (toChild > childIds.length) {
+            toChild = childIds.length;
+        }
+        if (fromChild >= toChild) {
+            return ("", new uint256[](0));
         }
+
+        lengths = new uint256[](toChild - fromChild);
+        for (uint256 i = fromChild; i < toChild; i++) {
+            lengths[i - fromChild] = bytes(nftData[childIds[i]].fileBase64).length;
+        }
+        combinedFileBase64 = _combineFiles(parentId, fromChild, toChild, false);
     }
 
     function getEntireNFT(uint256 parentId)
@@ -325,12 +351,7 @@ contract MolNFT is ERC721Enumerable, Ownable {
         SEQUENCE = parentData.SEQUENCE;
         imageBase64 = parentData.imageBase64;
 
-        combinedFileBase64 = parentData.fileBase64;
-        uint256[] storage childIds = children[parentId];
-        for (uint256 i = 0; i < childIds.length; i++) {
-            NFTData storage childData = nftData[childIds[i]];
-            combinedFileBase64 = string(abi.encodePacked(combinedFileBase64, childData.fileBase64));
-        }
+        combinedFileBase64 = _combineFiles(parentId, 0, children[parentId].length, true);
     }
 
     // ------------------------ SEARCH ------------------------------------------
@@ -517,6 +538,67 @@ contract MolNFT is ERC721Enumerable, Ownable {
         return "";
     }
 
+    // --------------------- FILE CONCATENATION ---------------------------------
+
+    /**
+     * @dev fileBase64 of the parent (if withParent) followed by children
+     * [fromChild, toChild), copied into one buffer allocated up front.
+     */
+    function _combineFiles(
+        uint256 parentId,
+        uint256 fromChild,
+        uint256 toChild,
+        bool withParent
+    ) internal view returns (string memory) {
+        uint256[] storage childIds = children[parentId];
+
+        uint256 total = withParent ? bytes(nftData[parentId].fileBase64).length : 0;
+        for (uint256 i = fromChild; i < toChild; i++) {
+            total += bytes(nftData[childIds[i]].fileBase64).length;
+        }
+
+        bytes memory combined = new bytes(total);
+        uint256 dest;
+        assembly ("memory-safe") {
+            dest := add(combined, 32)
+        }
+        if (withParent) {
+            dest = _copyFromStorage(nftData[parentId].fileBase64, dest);
+        }
+        for (uint256 i = fromChild; i < toChild; i++) {
+            dest = _copyFromStorage(nftData[childIds[i]].fileBase64, dest);
+        }
+        return string(combined);
+    }
+
+    /**
+     * @dev Copies a storage string to memory at dest, a word at a time, and
+     * returns where the copy ends. Up to 31 bytes past the end are
+     * overwritten: the next copy or, after the last one, unallocated memory.
+     */
+    function _copyFromStorage(string storage source, uint256 dest) private view returns (uint256 end) {
+        assembly ("memory-safe") {
+            let slot := sload(source.slot)
+            switch and(slot, 1)
+            case 0 {
+                // Short string: the data and length * 2 share one slot
+                mstore(dest, and(slot, not(0xff)))
+                end := add(dest, shr(1, and(slot, 0xff)))
+            }
+            default {
+                // Long string: length * 2 + 1 in the slot, data from keccak256(slot)
+                end := add(dest, shr(1, slot))
+                mstore(0, source.slot)
+                for { let data := keccak256(0, 32) } lt(dest, end) {
+                    dest := add(dest, 32)
+                    data := add(data, 1)
+                } {
+                    mstore(dest, sload(data))
+                }
+            }
+        }
+    }
+
     // --------------------- STRING UTILITIES -----------------------------------
 
     function _compareStrings(string memory a, string memory b)